@@ -1,6 +1,16 @@
 """Universal Documentation Crawler for LLM Training."""
 
-from .crawler import UniversalDocsCrawler, create_sample_config, main
+from .crawler import (
+    UniversalDocsCrawler,
+    create_sample_config,
+    extract_site_name,
+    main,
+)
 
 __version__ = "0.1.0"
-__all__ = ["UniversalDocsCrawler", "create_sample_config", "main"]
+__all__ = [
+    "UniversalDocsCrawler",
+    "create_sample_config",
+    "extract_site_name",
+    "main",
+]
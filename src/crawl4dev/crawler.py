@@ -1,47 +1,590 @@
+import argparse
 import asyncio
+import contextlib
+import functools
 import json
+import logging
+import logging.handlers
 import os
+import random
 import re
 import shutil
 import subprocess
 import sys
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
+from queue import SimpleQueue
 from typing import Any
-from urllib.parse import unquote, urljoin, urlparse
+from urllib.parse import unquote, urljoin, urlsplit
+
+logger = logging.getLogger(__name__)
+
+try:  # Optional fast JSON serializer (pip install crawl4dev[speedups])
+    import orjson
+except ImportError:
+    orjson = None
+
+# Compiled once at import; these run per URL, per page, or per markdown line.
+# UI/navigation line patterns fused into one alternation so each markdown line
+# is matched with a single regex call instead of one call per pattern.
+_UI_LINE_RE = re.compile(
+    "|".join(
+        f"(?:{pattern})"
+        for pattern in (
+            r"^(Skip to|Navigation|Menu|Search|Toggle|Cookie|Privacy|Accept|Reject).*$",
+            r"^(Home|Docs|Documentation|Download|GitHub|Twitter|Facebook|LinkedIn)$",
+            r"^\s*\*\s*(Home|Docs|Download|Back to top|Table of contents).*$",
+            r"^\s*\[.*\]\(#.*\)\s*$",  # Anchor-only links
+            r"^(Edit this page|Edit on GitHub|Improve this doc).*$",
+            r"^(Last updated|Last modified|Published|Created).*$",
+            r"^(Share|Print|Copy link|Permalink).*$",
+            r"^\s*[\*\-\+]\s*$",  # Empty list items
+            r"^(Previous|Next|←|→|\<|\>)(\s|$)",  # Navigation arrows
+        )
+    ),
+    re.IGNORECASE,
+)
+# "${...}" and "{{...}}" without backtracking: the body stops at the next
+# opener, so a URL full of unclosed openers is scanned once, not once per opener
+_TEMPLATE_VAR_PATTERN = r"\$\{(?:[^$}\n]|\$(?!\{))*+\}"
+_MUSTACHE_VAR_PATTERN = r"\{\{(?:[^{}\n]|\{(?!\{)|\}(?!\}))*+\}\}"
+# Template/placeholder markers fused into one search per URL
+_INVALID_URL_RE = re.compile(
+    "|".join(
+        f"(?:{pattern})"
+        for pattern in (
+            _TEMPLATE_VAR_PATTERN,  # ${variable}
+            _MUSTACHE_VAR_PATTERN,  # {{variable}}
+            r"<[^>]*>",  # <placeholder>
+            r"\*",  # wildcards
+            r"undefined",  # literal undefined
+            r"null",  # literal null
+        )
+    ),
+    re.IGNORECASE,
+)
+_INVALID_URL_MARKERS = ("${", "{{", "<", "*", "undefined", "null")
+_JS_LINK_RE = re.compile(r"\[([^\]]+)\]\(javascript:.*?\)")
+_ANCHOR_LINK_RE = re.compile(r"\[([^\]]+)\]\(#[^)]*\)")
+# Whitespace, header-depth and empty code block cleanup fused into one pass;
+# the replacement for each match is picked by its group name. Empty table rows
+# stay a separate pass: removing a code block can expose a row ending.
+_CLEANUP_RE = re.compile(
+    r"(?P<blank_lines>\n\s*\n\s*\n+)"  # Excessive whitespace
+    r"|(?P<deep_header>(?m:^)#{5,})"  # Headers deeper than 4 levels
+    r"|(?P<empty_code_block>```\s*\n\s*```)"
+)
+_CLEANUP_REPLACEMENTS = {
+    "blank_lines": "\n\n",
+    "deep_header": "####",  # Max 4 levels for LLM clarity
+    "empty_code_block": "",
+}
+_EMPTY_TABLE_ROW_RE = re.compile(r"\|\s*\|\s*\|\s*\n")
+_REPEATED_RULES_RE = re.compile(r"(\n---+\s*\n){2,}")
+_HEADER_SPACING_RE = re.compile(r"\n(#{1,4}\s+[^\n]+)\n(?!\n)")
+_CODE_BLOCK_SPACING_RE = re.compile(r"\n(```[^`]*```)\n(?!\n)")
+_MD_LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+_MD_LINK_TEXT_RE = re.compile(r"\[([^\]]+)\]\([^)]+\)")
+_MD_FORMATTING_TABLE = str.maketrans("", "", "*_`")
+_HREF_RE = re.compile(r'href=["\']([^"\']+)["\']', re.IGNORECASE)
+_UNSAFE_TITLE_RE = re.compile(r"[^\w\-_\s]")
+_WHITESPACE_RUN_RE = re.compile(r"\s+")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+# Numbered/named group references and conditional groups "(?(1)...)" only
+# stay correct in a pattern of their own
+_BACKREFERENCE_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+# A ".*literal.*" URL pattern is just a case-insensitive substring test
+_LITERAL_URL_PATTERN_RE = re.compile(r"\.\*((?:[^\\.^$*+?{}\[\]|()]|\\[^\w\s])+)\.\*")
+_REGEX_ESCAPE_RE = re.compile(r"\\(.)")
+
+# Streamed report files are written in many small pieces; a 1 MiB buffer turns
+# those into a handful of large write syscalls
+_WRITE_BUFFER_SIZE = 1 << 20
+# Chunk headers are sized before the chunk count is known
+_TOTAL_CHUNKS_PLACEHOLDER = "[total_chunks_placeholder]"
+# Rough token estimate used for chunk sizing: 1 token ≈ 4 characters
+_CHARS_PER_TOKEN = 4
+# Per-page files are small and independent; overlapping their open/write/close
+# syscalls on a thread pool hides filesystem latency
+_WRITER_THREADS = min(32, (os.cpu_count() or 1) * 4)
+# Seconds to wait for Playwright to report the Chromium path before installing
+_PLAYWRIGHT_PROBE_TIMEOUT = 10
+# Page chrome stripped by crawl4ai unless config provides excluded_tags
+_DEFAULT_EXCLUDED_TAGS = (
+    "nav",
+    "header",
+    "footer",
+    "aside",
+    "script",
+    "style",
+    "noscript",
+    "iframe",
+    "form",
+    "button",
+)
+# What create_site_directory does when the site directory already exists;
+# "prompt" asks on a TTY and falls back to "timestamp" otherwise
+_EXISTING_DIR_ACTIONS = ("prompt", "overwrite", "timestamp", "fail")
+_YES_ANSWERS = frozenset({"y", "yes"})
+_NO_ANSWERS = frozenset({"n", "no"})
+# What may follow the scheme://host prefix of an on-site URL ("" is the bare host)
+_HOST_END = frozenset({"", "/", "?", "#"})
+
+# SplitResult is an immutable tuple, so parses can be shared; the same URL is
+# parsed by validation, page processing and each of the file writers
+_urlsplit = functools.lru_cache(maxsize=8192)(urlsplit)
+
+# Page fields that are already saved as their own files; raw HTML never goes
+# into the metadata JSON, markdown only while embed_pages_in_metadata is on
+_PAGE_BODY_FIELDS = frozenset({"markdown", "raw_html"})
+_PAGE_HTML_FIELDS = frozenset({"raw_html"})
+
+# Absolute, protocol-relative and non-navigational link targets
+_SKIPPED_LINK_PREFIXES = ("http", "//", "mailto:", "tel:", "javascript:")
+
+
+# Base URL path fragments that mark a documentation tree
+_DOC_PATH_INDICATORS = (
+    "docs",
+    "documentation",
+    "guide",
+    "manual",
+    "help",
+    "wiki",
+    "api",
+)
+
+# Common file types that aren't web pages (suffix after the last ".")
+_FILE_EXTENSIONS = frozenset(
+    {
+        # Images
+        "png",
+        "jpg",
+        "jpeg",
+        "gif",
+        "svg",
+        "webp",
+        "ico",
+        "bmp",
+        # Documents
+        "pdf",
+        "doc",
+        "docx",
+        "xls",
+        "xlsx",
+        "ppt",
+        "pptx",
+        # Archives
+        "zip",
+        "tar",
+        "gz",
+        "rar",
+        "7z",
+        # Installers
+        "exe",
+        "dmg",
+        "pkg",
+        # Media
+        "mp4",
+        "mp3",
+        "avi",
+        "mov",
+        "wav",
+        # Code/Data
+        "json",
+        "xml",
+        "csv",
+        "txt",
+        "log",
+        # Fonts
+        "woff",
+        "woff2",
+        "ttf",
+        "eot",
+        # Other
+        "css",
+        "js",
+        "map",
+    }
+)
 
-from crawl4ai import AsyncWebCrawler
+_SHORT_LINE_KEEP = frozenset({"#", "##", "###", "####", "---", "***"})
 
 
-def check_and_install_playwright() -> bool:
-    """Check if Playwright browsers are installed and install if needed."""
-    try:
-        # Check if chromium is available by trying to get the executable path
-        result = subprocess.run(
-            [
-                sys.executable,
-                "-c",
-                "from playwright.sync_api import sync_playwright; "
-                "p = sync_playwright().start(); "
-                "print(p.chromium.executable_path); "
-                "p.stop()",
-            ],
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
+def _iter_clean_lines(markdown: str) -> Iterator[str]:
+    """Yield markdown lines with UI noise removed and link/indent fixes applied
+
+    Lines are split on newlines only, so other line-break characters stay in
+    the text; the carriage return of a CRLF line ending is dropped.
+    """
+    for line in markdown.split("\n"):
+        line = line.rstrip("\r")
+        stripped = line.strip()
+
+        # Keep empty lines (will be normalized later)
+        if not stripped:
+            yield ""
+            continue
+
+        # Skip UI patterns
+        if _UI_LINE_RE.match(stripped):
+            continue
+
+        # Skip very short lines that are likely UI elements
+        if len(stripped) < 3 and stripped not in _SHORT_LINE_KEEP:
+            continue
+
+        # Fix excessive indentation; str.isspace() and lstrip() use the same
+        # whitespace definition as the old r"^\s{8,}" substitution
+        if line[:8].isspace():
+            line = "    " + line.lstrip()
+
+        # Clean up link text; both link patterns need a literal "](", so most
+        # lines skip the regex engine entirely
+        if "](" in line:
+            line = _JS_LINK_RE.sub(r"\1", line)
+            line = _ANCHOR_LINK_RE.sub(r"\1", line)  # Remove anchor-only links
+        yield line
+
+
+class _CharClassTable(dict[int, int | str | None]):
+    """str.translate table equivalent to re.sub(r"[^\\w<keep>]", replacement, s)
+
+    Each code point is classified once with exact Unicode \\w semantics and
+    cached, so translation is a C-level table lookup (None deletes the char).
+    """
+
+    def __init__(self, keep: str, replacement: str | None) -> None:
+        super().__init__()
+        self._keep_re = re.compile(rf"[\w{re.escape(keep)}]")
+        self._replacement = replacement
+
+    def __missing__(self, codepoint: int) -> int | str | None:
+        value = codepoint if self._keep_re.match(chr(codepoint)) else self._replacement
+        self[codepoint] = value
+        return value
+
+
+# Slug/filename sanitizers for site names, anchors, sections and file names
+_SITE_NAME_TABLE = _CharClassTable("-", None)
+_SLUG_TABLE = _CharClassTable("-", "-")
+_FILENAME_TABLE = _CharClassTable("-_.", "_")
+# Host labels that name the docs subdomain rather than the project
+_DOCS_HOST_PREFIXES = frozenset({"docs", "documentation", "help", "api"})
+
+
+def _section_of(page: dict[str, Any]) -> str:
+    """Top-level section of a page, from its crawl-time field or its path"""
+    return page.get("section") or page["path"].split("/", 1)[0] or "home"
+
+
+@functools.lru_cache(maxsize=4096)
+def _safe_path_from_url(url: str) -> str:
+    """Filename-safe form of a URL's path ("" for the site root)"""
+    url_path = _urlsplit(url).path
+    if url_path == "/" or not url_path:
+        return ""
+    return url_path.strip("/").replace("/", "_").translate(_FILENAME_TABLE)
+
+
+@functools.lru_cache(maxsize=256)
+def extract_site_name(url: str) -> str:
+    """Short directory-safe site name for a URL's host"""
+    # Only a leading www. is dropped, as main() does for the default site name
+    site_name = _urlsplit(url).netloc.lower().removeprefix("www.")
+
+    # For domains like caddyserver.com -> caddyserver
+    # For domains like docs.netmaker.io -> netmaker
+    # For domains like opentofu.org -> opentofu
+    head, sep, rest = site_name.partition(".")
+    if sep:
+        # Use second label if the first is docs-related, else the first label
+        site_name = rest.partition(".")[0] if head in _DOCS_HOST_PREFIXES else head
+
+    # Clean site name (remove any remaining special characters)
+    return site_name.translate(_SITE_NAME_TABLE)
+
+
+def _compute_stats(results: list[dict[str, Any]]) -> dict[str, Any]:
+    """Aggregate word/character totals, longest page and sections in one pass"""
+    total_words = 0
+    total_chars = 0
+    longest: dict[str, Any] | None = None
+    sections: set[str] = set()
+    for r in results:
+        total_words += r["word_count"]
+        total_chars += r.get("content_length", 0)
+        if longest is None or r["word_count"] > longest["word_count"]:
+            longest = r
+        sections.add(_section_of(r))
+    return {
+        "total_words": total_words,
+        "total_chars": total_chars,
+        "longest": longest["title"] if longest is not None else "",
+        "avg_words": total_words / len(results) if results else 0,
+        "sections_set": sections,
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _isoformat_for_second(second: int) -> str:
+    """Local ISO timestamp for a whole epoch second (formatted once per second)"""
+    return datetime.fromtimestamp(second).isoformat(timespec="seconds")
+
+
+class _ForwardingHandler(logging.Handler):
+    """Hand records on to another logger's handlers"""
+
+    def __init__(self, target: logging.Logger, level: int) -> None:
+        super().__init__(level)
+        self.target = target
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.target.handle(record)
+
 
-        # If we get here, Playwright browsers are already installed
-        if result.stdout.strip() and Path(result.stdout.strip()).exists():
-            return True
+@contextlib.contextmanager
+def _queued_logging() -> Iterator[None]:
+    """Route crawl log records through a QueueListener for the duration
+
+    Records are handed to a background thread that writes them to stdout, so
+    workers never block on console I/O. Left alone if the application has
+    configured this logger or already shows its INFO records; if it logs at a
+    higher level, only the progress lines it would drop are printed here and
+    the rest still reach its handlers.
+    """
+    if logger.handlers or (logger.hasHandlers() and logger.isEnabledFor(logging.INFO)):
+        yield
+        return
+
+    log_queue: SimpleQueue[logging.LogRecord] = SimpleQueue()
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    handlers: list[logging.Handler] = [console]
+    if logger.hasHandlers() and logger.parent is not None:
+        app_level = logger.getEffectiveLevel()
+        console.addFilter(lambda record: record.levelno < app_level)
+        handlers.append(_ForwardingHandler(logger.parent, app_level))
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+
+    level, propagate = logger.level, logger.propagate
+    logger.addHandler(queue_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    listener.start()
+    try:
+        yield
+    finally:
+        listener.stop()  # Drains pending records before returning
+        logger.removeHandler(queue_handler)
+        logger.setLevel(level)
+        logger.propagate = propagate
+
+
+@contextlib.contextmanager
+def _atomic_open(path: str, mode: str = "w", **kwargs: Any) -> Iterator[Any]:
+    """Open a same-directory temp file that replaces path once fully written
+
+    A crash mid-write leaves the previous file (or none) in place instead of
+    a truncated one; the temp file is removed if the write fails.
+    """
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    try:
+        with open(tmp_path, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
+def _write_text_file(path: str, content: str) -> None:
+    """Write one UTF-8 text file (run on the per-page writer pool)"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def _write_json(path: str, data: Any) -> None:
+    """Write data as indented UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        with _atomic_open(path, "wb") as f:
+            f.write(
+                orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            )
+        return
 
-    except (
-        subprocess.CalledProcessError,
-        subprocess.TimeoutExpired,
-        FileNotFoundError,
+    # json.dump emits many tiny fragments; a large buffer batches them
+    with _atomic_open(path, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def _trim_dot_star(pattern: str) -> str:
+    """Drop a leading/trailing ".*" that re.search makes redundant
+
+    search() already tries every start position and only needs some match,
+    so ".*x.*" finds the same URLs as "x" without the backtracking.
+    """
+    # Keep a leading ".*" that carries its own modifier (".*?", ".*+")
+    if pattern.startswith(".*") and pattern[2:3] not in ("?", "+", "*", "{"):
+        pattern = pattern[2:]
+    if pattern.endswith(".*"):
+        body = pattern[:-2]
+        # An odd run of backslashes means the dot is escaped ("\\.*")
+        if (len(body) - len(body.rstrip("\\"))) % 2 == 0:
+            pattern = body
+    return pattern
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_url_patterns(patterns: tuple[str, ...]) -> tuple[re.Pattern[str], ...]:
+    """Compile configured include/exclude URL patterns (cached per pattern set).
+
+    The set is fused into one alternation so each URL costs a single search.
+    Patterns that cannot share a regex safely (group back-references, inline
+    global flags) fall back to one compiled pattern each.
+    """
+    if not patterns:
+        return ()
+    patterns = tuple(_trim_dot_star(pattern) for pattern in patterns)
+    if not any(_BACKREFERENCE_RE.search(pattern) for pattern in patterns):
+        try:
+            fused = "|".join(f"(?:{pattern})" for pattern in patterns)
+            return (re.compile(fused, re.IGNORECASE),)
+        except re.error:
+            pass
+    return tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+
+
+@functools.lru_cache(maxsize=64)
+def _split_url_patterns(
+    patterns: tuple[str, ...],
+) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Separate ".*literal.*" patterns (as lowercase substrings) from real regexes"""
+    literals = []
+    regexes = []
+    for pattern in patterns:
+        match = _LITERAL_URL_PATTERN_RE.fullmatch(pattern)
+        if match and match.group(1).isascii():
+            literals.append(_REGEX_ESCAPE_RE.sub(r"\1", match.group(1)).lower())
+        else:
+            regexes.append(pattern)
+    return tuple(literals), tuple(regexes)
+
+
+def _matches_url_patterns(url: str, patterns: tuple[str, ...]) -> bool:
+    """Whether url matches any pattern, trying plain substring tests first"""
+    literals, regexes = _split_url_patterns(patterns)
+    if literals:
+        if not url.isascii():
+            # IGNORECASE folds some non-ASCII letters onto ASCII ones (e.g.
+            # the Kelvin sign onto "k"), so leave such URLs to the regexes
+            regexes = patterns
+        else:
+            lowered = url.lower()
+            if any(literal in lowered for literal in literals):
+                return True
+    return any(pattern.search(url) for pattern in _compile_url_patterns(regexes))
+
+
+@functools.lru_cache(maxsize=65536)
+def _check_url(
+    url: str,
+    domain: str | None,
+    include: tuple[str, ...],
+    exclude: tuple[str, ...],
+) -> str | None:
+    """Validate a URL against a domain and pattern set (memoized per URL)
+
+    Nav menus and sidebars link the same URLs from every page, so repeat
+    checks are answered from the cache instead of re-running every regex.
+    Returns None for a URL to crawl, otherwise why it was rejected: a message
+    for the caller to log, or "" for routine rejects. Logging stays with the
+    caller so a cached reject is still reported every time it is seen.
+    """
+    # Off-site links are the bulk of rejects; a prefix check settles them
+    # before any parsing or regex work. The host must also end where the
+    # prefix does, so "https://example.com.evil.net" and "...com@evil.net"
+    # are not taken for "https://example.com"
+    if domain and (
+        not url.startswith(domain)
+        or url[len(domain) : len(domain) + 1] not in _HOST_END
     ):
-        pass  # Browser not found, need to install
+        return ""
+
+    # Basic URL format validation
+    try:
+        parsed = _urlsplit(url)
+        if not parsed.scheme or not parsed.netloc:
+            return ""
+    except Exception:
+        return ""
+
+    # Skip common file types that aren't web pages (set lookup, no regex)
+    if url.rsplit(".", 1)[-1].lower() in _FILE_EXTENSIONS:
+        return "⚠️  Skipping file URL (not a webpage)"
+
+    # Decode URL-encoded characters for better pattern matching
+    try:
+        decoded_url = unquote(url)
+    except Exception:
+        decoded_url = url
+
+    # Check for template variables and placeholders; every alternative in
+    # _INVALID_URL_RE needs one of these literals, so most URLs skip the regex
+    decoded_lower = decoded_url.lower()
+    if any(
+        marker in decoded_lower for marker in _INVALID_URL_MARKERS
+    ) and _INVALID_URL_RE.search(decoded_url):
+        return "⚠️  Skipping invalid URL with template/placeholder"
+
+    # If domain is not set yet (during testing), only check basic format
+    if not domain:
+        return None
+
+    # Excludes first: most rejected links (login, assets, anchors) stop here
+    # without paying for the include patterns
+    if exclude and _matches_url_patterns(url, exclude):
+        return ""
+
+    if include and not _matches_url_patterns(url, include):
+        return ""
+    return None
+
+
+def _probe_chromium_path(found: list[str]) -> None:
+    """Append the Chromium path Playwright reports; any failure appends nothing"""
+    try:
+        from playwright.sync_api import sync_playwright
+
+        with sync_playwright() as playwright:
+            found.append(playwright.chromium.executable_path)
+    except Exception:
+        pass  # Missing or broken Playwright: the caller installs the browser
+
+
+def check_and_install_playwright() -> bool:
+    """Check if Playwright browsers are installed and install if needed."""
+    # Probe in-process rather than in a child interpreter. The Sync API needs a
+    # thread without a running event loop, and a daemon thread keeps the old
+    # probe timeout so a hung driver falls through to the install below
+    found: list[str] = []
+    probe = threading.Thread(target=_probe_chromium_path, args=(found,), daemon=True)
+    probe.start()
+    probe.join(_PLAYWRIGHT_PROBE_TIMEOUT)
+
+    # If we get here with a path, Playwright browsers are already installed
+    if found and found[0] and Path(found[0]).exists():
+        return True
 
     # Install Playwright browsers
     print("🎭 First-time setup: Installing Playwright browser (Chromium)...")
@@ -69,46 +612,60 @@ def check_and_install_playwright() -> bool:
 
 
 class UniversalDocsCrawler:
-    def __init__(self, config: dict[str, Any] | None = None) -> None:
+    def __init__(
+        self, config: dict[str, Any] | None = None, *, keep_raw_html: bool = True
+    ) -> None:
         self.config = config or {}
         self.base_url = ""
         self.domain = ""
         self.crawled_urls: set[str] = set()
         self.results: list[dict[str, Any]] = []
+        self.total_words = 0  # Running word count of self.results
         self.failed_urls: list[str] = []
         self.url_patterns = self.config.get("url_patterns", {})
+        self._crawl_params = self._build_crawl_params()
+        self._keep_raw_html = keep_raw_html
 
     def setup_for_website(self, base_url: str) -> None:
         """Setup crawler for a specific website"""
         self.base_url = base_url.rstrip("/")
-        parsed = urlparse(base_url)
+        parsed = _urlsplit(base_url)
         self.domain = f"{parsed.scheme}://{parsed.netloc}"
+        self._crawl_params = self._build_crawl_params()
         self.auto_detect_patterns()
 
+    def _build_crawl_params(self) -> dict[str, Any]:
+        """Resolve the per-page arun() arguments from config once per site"""
+        crawl_params = {
+            "word_count_threshold": self.config.get("min_word_count", 20),
+            "remove_overlay_elements": True,
+            "clean_html": True,
+            "delay_before_return_html": self.config.get("delay", 1.5),
+            "excluded_tags": self.config.get("excluded_tags", _DEFAULT_EXCLUDED_TAGS),
+            # Add timeout settings
+            "page_timeout": self.config.get("page_timeout", 30000),  # 30 seconds
+        }
+
+        # Add CSS selector if specified
+        if self.config.get("content_selector"):
+            crawl_params["css_selector"] = self.config["content_selector"]
+
+        return crawl_params
+
     def auto_detect_patterns(self) -> None:
         """Auto-detect common documentation URL patterns"""
-        path = urlparse(self.base_url).path.lower()
+        path = _urlsplit(self.base_url).path.lower()
 
         if not self.url_patterns.get("include"):
             include_patterns = []
-            doc_indicators = [
-                "docs",
-                "documentation",
-                "guide",
-                "manual",
-                "help",
-                "wiki",
-                "api",
-            ]
-
-            for indicator in doc_indicators:
+            for indicator in _DOC_PATH_INDICATORS:
                 if indicator in path:
                     # Create patterns that match both path segments and general occurrences
                     include_patterns.append(f".*{indicator}.*")
                     include_patterns.append(f".*/{indicator}/.*")
 
             if not include_patterns:
-                base_path = urlparse(self.base_url).path.rstrip("/")
+                base_path = _urlsplit(self.base_url).path.rstrip("/")
                 if base_path:
                     include_patterns.append(f"{re.escape(base_path)}/.*")
 
@@ -127,211 +684,90 @@ class UniversalDocsCrawler:
                 r".*/admin.*",
                 r".*/dashboard.*",
                 r".*/settings.*",
-                # File types (also handled in is_valid_url but good to have here too)
-                r".*\.(pdf|zip|tar|gz|exe|dmg|pkg|png|jpg|jpeg|gif|svg|webp|ico|bmp)$",
+                # File types are rejected by suffix in _check_url (_FILE_EXTENSIONS)
                 # Asset directories
-                r".*/(_images|images|img|assets|static|media|files|downloads)/.*",
+                r".*/(?:_images|images|img|assets|static|media|files|downloads)/.*",
                 r".*#.*",  # Skip anchor links
                 r".*\?.*page=.*",  # Skip pagination
                 r".*/search.*",
                 r".*/tag.*",
                 r".*/category.*",
                 # Add patterns for template variables and invalid URLs
-                r".*\$\{.*\}.*",  # Template variables like ${url}
-                r".*\{\{.*\}\}.*",  # Handlebars/Mustache templates
+                _TEMPLATE_VAR_PATTERN,  # Template variables like ${url}
+                _MUSTACHE_VAR_PATTERN,  # Handlebars/Mustache templates
                 r".*\%7B.*\%7D.*",  # URL-encoded braces
                 r".*<.*>.*",  # Angle bracket placeholders
                 r".*/\*.*",  # Wildcard paths
             ]
 
+        # Compile once up front: warms the cache is_valid_url reads from and
+        # surfaces a malformed configured pattern before any page is fetched
+        for kind in ("include", "exclude"):
+            patterns = tuple(self.url_patterns[kind])
+            try:
+                _compile_url_patterns(patterns)
+            except re.error as e:
+                raise ValueError(
+                    f"Invalid {kind} URL pattern {e.pattern!r}: {e}"
+                ) from e
+
     def is_valid_url(self, url: str | None) -> bool:
         """Check if URL should be crawled with enhanced validation"""
         if not url or not isinstance(url, str):
             return False
 
-        # Basic URL format validation
-        try:
-            parsed = urlparse(url)
-            if not parsed.scheme or not parsed.netloc:
-                return False
-        except Exception:
-            return False
-
-        # Skip common file types that aren't web pages
-        file_extensions = [
-            # Images
-            ".png",
-            ".jpg",
-            ".jpeg",
-            ".gif",
-            ".svg",
-            ".webp",
-            ".ico",
-            ".bmp",
-            # Documents
-            ".pdf",
-            ".doc",
-            ".docx",
-            ".xls",
-            ".xlsx",
-            ".ppt",
-            ".pptx",
-            # Archives
-            ".zip",
-            ".tar",
-            ".gz",
-            ".rar",
-            ".7z",
-            # Media
-            ".mp4",
-            ".mp3",
-            ".avi",
-            ".mov",
-            ".wav",
-            # Code/Data
-            ".json",
-            ".xml",
-            ".csv",
-            ".txt",
-            ".log",
-            # Fonts
-            ".woff",
-            ".woff2",
-            ".ttf",
-            ".eot",
-            # Other
-            ".css",
-            ".js",
-            ".map",
-        ]
-
-        url_lower = url.lower()
-        if any(url_lower.endswith(ext) for ext in file_extensions):
-            print(f"⚠️  Skipping file URL (not a webpage): {url}")
-            return False
-
-        # Decode URL-encoded characters for better pattern matching
-        try:
-            decoded_url = unquote(url)
-        except Exception:
-            decoded_url = url
-
-        # Check for template variables and placeholders
-        invalid_patterns = [
-            r"\$\{.*\}",  # ${variable}
-            r"\{\{.*\}\}",  # {{variable}}
-            r"<[^>]*>",  # <placeholder>
-            r"\*",  # wildcards
-            r"undefined",  # literal undefined
-            r"null",  # literal null
-        ]
-
-        if any(
-            re.search(pattern, decoded_url, re.IGNORECASE)
-            for pattern in invalid_patterns
-        ):
-            print(f"⚠️  Skipping invalid URL with template/placeholder: {url}")
-            return False
-
-        # If domain is not set yet (during testing), only check basic format
-        if not self.domain:
-            return True
-
-        if not url.startswith(self.domain):
-            return False
-
-        include_patterns = self.url_patterns.get("include", [])
-        if include_patterns and not any(
-            re.search(pattern, url, re.IGNORECASE) for pattern in include_patterns
-        ):
-            return False
-
-        exclude_patterns = self.url_patterns.get("exclude", [])
-        return not (
-            exclude_patterns
-            and any(
-                re.search(pattern, url, re.IGNORECASE) for pattern in exclude_patterns
-            )
+        reason = _check_url(
+            url,
+            self.domain,
+            tuple(self.url_patterns.get("include") or ()),
+            tuple(self.url_patterns.get("exclude") or ()),
         )
+        if reason:
+            logger.warning("%s: %s", reason, url)
+        return reason is None
+
+    def is_valid_urls(self, urls: Iterable[str | None]) -> list[bool]:
+        """Batch form of is_valid_url for a page's worth of links"""
+        # Resolve the pattern tuples once for the whole batch
+        domain = self.domain
+        include = tuple(self.url_patterns.get("include") or ())
+        exclude = tuple(self.url_patterns.get("exclude") or ())
+        valid = []
+        for url in urls:
+            if not url or not isinstance(url, str):
+                valid.append(False)
+                continue
+            reason = _check_url(url, domain, include, exclude)
+            if reason:
+                logger.warning("%s: %s", reason, url)
+            valid.append(reason is None)
+        return valid
 
     def clean_markdown_for_llm(self, markdown: str, url: str) -> str:
         """Advanced markdown cleaning optimized for LLM consumption"""
         if not markdown:
             return ""
 
-        # Step 1: Remove common UI elements and navigation
-        ui_patterns = [
-            r"^(Skip to|Navigation|Menu|Search|Toggle|Cookie|Privacy|Accept|Reject).*$",
-            r"^(Home|Docs|Documentation|Download|GitHub|Twitter|Facebook|LinkedIn)$",
-            r"^\s*\*\s*(Home|Docs|Download|Back to top|Table of contents).*$",
-            r"^\s*\[.*\]\(#.*\)\s*$",  # Anchor-only links
-            r"^(Edit this page|Edit on GitHub|Improve this doc).*$",
-            r"^(Last updated|Last modified|Published|Created).*$",
-            r"^(Share|Print|Copy link|Permalink).*$",
-            r"^\s*[\*\-\+]\s*$",  # Empty list items
-            r"^(Previous|Next|←|→|\<|\>)(\s|$)",  # Navigation arrows
-        ]
-
-        lines = markdown.split("\n")
-        cleaned_lines = []
-
-        # Step 2: Process each line
-        for line in lines:
-            original_line = line
-            line = line.strip()
-
-            # Skip empty lines (will be normalized later)
-            if not line:
-                cleaned_lines.append("")
-                continue
-
-            # Skip UI patterns
-            if any(re.match(pattern, line, re.IGNORECASE) for pattern in ui_patterns):
-                continue
-
-            # Skip very short lines that are likely UI elements
-            if len(line) < 3 and line not in ["#", "##", "###", "####", "---", "***"]:
-                continue
-
-            # Clean up common issues
-            line = original_line
-
-            # Fix excessive indentation
-            line = re.sub(r"^\s{8,}", "    ", line)
-
-            # Clean up link text
-            line = re.sub(r"\[([^\]]+)\]\(javascript:.*?\)", r"\1", line)
-            line = re.sub(
-                r"\[([^\]]+)\]\(#[^)]*\)", r"\1", line
-            )  # Remove anchor-only links
-
-            cleaned_lines.append(line)
-
-        # Step 3: Rejoin and normalize
-        cleaned = "\n".join(cleaned_lines)
+        # Steps 1-3: Drop UI/navigation lines and rejoin (see _iter_clean_lines)
+        cleaned = "\n".join(_iter_clean_lines(markdown))
 
         # Step 4: Advanced cleaning
-        # Remove excessive whitespace
-        cleaned = re.sub(r"\n\s*\n\s*\n+", "\n\n", cleaned)
-
-        # Normalize headers (max 4 levels for LLM clarity)
-        cleaned = re.sub(r"^#{5,}", "####", cleaned, flags=re.MULTILINE)
-
-        # Remove empty code blocks
-        cleaned = re.sub(r"```\s*\n\s*```", "", cleaned)
+        # Collapse blank lines, cap header depth and drop empty code blocks in
+        # a single scan (see _CLEANUP_RE)
+        cleaned = _CLEANUP_RE.sub(lambda m: _CLEANUP_REPLACEMENTS[m.lastgroup], cleaned)
 
         # Clean up tables (remove empty rows)
-        cleaned = re.sub(r"\|\s*\|\s*\|\s*\n", "", cleaned)
+        cleaned = _EMPTY_TABLE_ROW_RE.sub("", cleaned)
 
         # Remove excessive horizontal rules
-        cleaned = re.sub(r"(\n---+\s*\n){2,}", "\n---\n", cleaned)
+        cleaned = _REPEATED_RULES_RE.sub("\n---\n", cleaned)
 
         # Step 5: Structure optimization for LLMs
         # Ensure proper spacing around headers
-        cleaned = re.sub(r"\n(#{1,4}\s+[^\n]+)\n(?!\n)", r"\n\1\n\n", cleaned)
+        cleaned = _HEADER_SPACING_RE.sub(r"\n\1\n\n", cleaned)
 
         # Ensure proper spacing around code blocks
-        cleaned = re.sub(r"\n(```[^`]*```)\n(?!\n)", r"\n\1\n\n", cleaned)
+        cleaned = _CODE_BLOCK_SPACING_RE.sub(r"\n\1\n\n", cleaned)
 
         # Final cleanup
         cleaned = cleaned.strip()
@@ -340,47 +776,49 @@ class UniversalDocsCrawler:
 
     def extract_title_and_description(self, markdown: str, url: str) -> tuple[str, str]:
         """Extract meaningful title and description from content"""
-        lines = [line.strip() for line in markdown.split("\n") if line.strip()]
-
         title = ""
         description = ""
 
-        # Try to find title from first header
-        for line in lines:
-            if line.startswith("# "):
-                title = line[2:].strip()
-                break
-            elif line.startswith("## ") and not title:
-                title = line[3:].strip()
+        # One pass that stops as soon as both are found: the title is the
+        # first header, the description the first substantial paragraph
+        in_code_block = False
+        for line in markdown.split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+
+            if not title:
+                if line.startswith("# "):
+                    title = line[2:].strip()
+                elif line.startswith("## "):
+                    title = line[3:].strip()
+
+            if not description:
+                if line.startswith("```"):
+                    in_code_block = not in_code_block
+                elif not in_code_block and not line.startswith("#") and len(line) > 50:
+                    # Clean up the line for description
+                    desc_line = _MD_LINK_TEXT_RE.sub(r"\1", line)  # Remove links
+                    # Remove formatting
+                    desc_line = desc_line.translate(_MD_FORMATTING_TABLE)
+                    if len(desc_line) > 30:
+                        description = (
+                            desc_line[:200] + "..."
+                            if len(desc_line) > 200
+                            else desc_line
+                        )
+
+            if title and description:
                 break
 
         # Fallback: extract from URL
         if not title:
-            path_parts = urlparse(url).path.strip("/").split("/")
+            path_parts = _urlsplit(url).path.strip("/").split("/")
             if path_parts and path_parts[-1]:
                 title = path_parts[-1].replace("-", " ").replace("_", " ").title()
             else:
                 title = "Documentation"
 
-        # Extract description from first substantial paragraph
-        in_code_block = False
-        for line in lines:
-            if line.startswith("```"):
-                in_code_block = not in_code_block
-                continue
-
-            if not in_code_block and not line.startswith("#") and len(line) > 50:
-                # Clean up the line for description
-                desc_line = re.sub(
-                    r"\[([^\]]+)\]\([^)]+\)", r"\1", line
-                )  # Remove links
-                desc_line = re.sub(r"[*_`]", "", desc_line)  # Remove formatting
-                if len(desc_line) > 30:
-                    description = (
-                        desc_line[:200] + "..." if len(desc_line) > 200 else desc_line
-                    )
-                    break
-
         return title, description
 
     def extract_links_from_content(
@@ -389,30 +827,26 @@ class UniversalDocsCrawler:
         """Extract relevant links from page content with better validation"""
         links = set()
 
-        # Extract from markdown links
-        markdown_links = re.findall(r"\[([^\]]+)\]\(([^)]+)\)", markdown)
-        for _text, url in markdown_links:
-            if not url.startswith(("http", "//", "mailto:", "tel:")):
-                try:
-                    full_url = urljoin(base_url, url)
-                    if self.is_valid_url(full_url):
-                        links.add(full_url)
-                except Exception:
-                    print(f"⚠️  Invalid URL found in markdown: {url}")
-                    continue
+        # Markdown links are mostly a repeat of the HTML hrefs (crawl4ai renders
+        # one from the other), so dedupe the raw targets from both sources
+        # before paying for urljoin and validation
+        raw_urls = {match.group(2) for match in _MD_LINK_RE.finditer(markdown)}
+        raw_urls.update(match.group(1) for match in _HREF_RE.finditer(html))
 
-        # Extract from HTML href attributes (more comprehensive)
-        html_links = re.findall(r'href=["\']([^"\']+)["\']', html, re.IGNORECASE)
-        for url in html_links:
-            if not url.startswith(("http", "//", "mailto:", "tel:", "javascript:")):
+        candidates = []
+        for url in raw_urls:
+            if not url.startswith(_SKIPPED_LINK_PREFIXES):
                 try:
-                    full_url = urljoin(base_url, url)
-                    if self.is_valid_url(full_url):
-                        links.add(full_url)
+                    candidates.append(urljoin(base_url, url))
                 except Exception:
-                    print(f"⚠️  Invalid URL found in HTML: {url}")
+                    logger.warning("⚠️  Invalid URL found in page content: %s", url)
                     continue
 
+        links.update(
+            url
+            for url, valid in zip(candidates, self.is_valid_urls(candidates))
+            if valid
+        )
         return links
 
     async def crawl_page(
@@ -420,44 +854,15 @@ class UniversalDocsCrawler:
     ) -> tuple[dict[str, Any] | None, set[str]]:
         """Crawl a single page with enhanced error handling"""
         try:
-            print(f"🔄 Crawling: {url}")
+            logger.info("🔄 Crawling: %s", url)
 
             # Pre-validate URL before attempting to crawl
             if not self.is_valid_url(url):
-                print(f"⚠️  Skipping invalid URL: {url}")
+                logger.warning("⚠️  Skipping invalid URL: %s", url)
                 return None, set()
 
-            # Configure crawling parameters
-            crawl_params = {
-                "url": url,
-                "word_count_threshold": self.config.get("min_word_count", 20),
-                "remove_overlay_elements": True,
-                "clean_html": True,
-                "delay_before_return_html": self.config.get("delay", 1.5),
-                "excluded_tags": self.config.get(
-                    "excluded_tags",
-                    [
-                        "nav",
-                        "header",
-                        "footer",
-                        "aside",
-                        "script",
-                        "style",
-                        "noscript",
-                        "iframe",
-                        "form",
-                        "button",
-                    ],
-                ),
-                # Add timeout settings
-                "page_timeout": self.config.get("page_timeout", 30000),  # 30 seconds
-            }
-
-            # Add CSS selector if specified
-            if self.config.get("content_selector"):
-                crawl_params["css_selector"] = self.config["content_selector"]
-
-            result = await crawler.arun(**crawl_params)
+            # Configuration-derived parameters are resolved once per site
+            result = await crawler.arun(url=url, **self._crawl_params)
 
             if result.success and result.markdown:
                 # Clean the markdown for LLM consumption
@@ -470,39 +875,51 @@ class UniversalDocsCrawler:
                     )
 
                     # Create structured path
-                    parsed_url = urlparse(url)
+                    parsed_url = _urlsplit(url)
                     path_parts = [p for p in parsed_url.path.strip("/").split("/") if p]
                     structured_path = "/".join(path_parts) if path_parts else "home"
+                    section = path_parts[0] if path_parts else "home"
 
                     page_data = {
                         "url": url,
                         "title": title,
                         "description": description,
                         "path": structured_path,
+                        "section": section,
                         "markdown": cleaned_markdown,
-                        "raw_html": result.html,  # Store raw HTML for later saving
                         "content_length": len(cleaned_markdown),
                         "word_count": len(cleaned_markdown.split()),
-                        "crawled_at": datetime.now().isoformat(),
+                        "crawled_at": _isoformat_for_second(int(time.time())),
                         "status_code": getattr(result, "status_code", 200),
                     }
 
+                    if self._keep_raw_html:
+                        # Store raw HTML for later saving
+                        page_data["raw_html"] = result.html
+
                     # Extract links for further crawling
                     found_links = self.extract_links_from_content(
                         result.html, result.markdown, url
                     )
 
-                    print(
-                        f"✅ Success: {title[:50]}... ({len(cleaned_markdown)} chars, {len(found_links)} links)"
+                    logger.info(
+                        "✅ Success: %s... (%d chars, %d links)",
+                        title[:50],
+                        len(cleaned_markdown),
+                        len(found_links),
                     )
                     return page_data, found_links
                 else:
-                    print(
-                        f"⚠️  Skipped: {url} (insufficient content: {len(cleaned_markdown)} chars)"
+                    logger.warning(
+                        "⚠️  Skipped: %s (insufficient content: %d chars)",
+                        url,
+                        len(cleaned_markdown),
                     )
             else:
-                print(
-                    f"❌ Failed: {url} (Status: {getattr(result, 'status_code', 'Unknown')})"
+                logger.warning(
+                    "❌ Failed: %s (Status: %s)",
+                    url,
+                    getattr(result, "status_code", "Unknown"),
                 )
                 self.failed_urls.append(url)
 
@@ -512,9 +929,11 @@ class UniversalDocsCrawler:
                 "net::ERR_HTTP_RESPONSE_CODE_FAILURE" in error_msg
                 or "template" in error_msg.lower()
             ):
-                print(f"⚠️  Skipping problematic URL: {url} (Template/Invalid URL)")
+                logger.warning(
+                    "⚠️  Skipping problematic URL: %s (Template/Invalid URL)", url
+                )
             else:
-                print(f"💥 Error crawling {url}: {error_msg}")
+                logger.warning("💥 Error crawling %s: %s", url, error_msg)
             self.failed_urls.append(url)
 
         return None, set()
@@ -529,12 +948,11 @@ class UniversalDocsCrawler:
         print(f"📍 Base URL: {self.base_url}")
         print(f"🌐 Domain: {self.domain}")
         print(f"📊 Max pages: {max_pages}")
+        print(f"⚡ Concurrency: {self.config.get('concurrency', 8)}")
         print(
             f"🎯 Include patterns: {self.url_patterns.get('include', 'Auto-detected')}"
         )
 
-        urls_to_crawl = {start_url}
-
         # Configure crawler with better error handling
         crawler_config = {
             "verbose": self.config.get("verbose", True),
@@ -548,32 +966,86 @@ class UniversalDocsCrawler:
             ),
         }
 
-        async with AsyncWebCrawler(**crawler_config) as crawler:
-            while urls_to_crawl and len(self.results) < max_pages:
-                current_url = urls_to_crawl.pop()
+        # Workers pull from a FIFO queue (breadth-first: shallow pages first);
+        # the companion set keeps "already queued" checks O(1)
+        queue: asyncio.Queue[str] = asyncio.Queue()
+        queue.put_nowait(start_url)
+        queued_urls = {start_url}
 
-                if current_url in self.crawled_urls:
-                    continue
-
-                self.crawled_urls.add(current_url)
-
-                # Crawl the current page
-                page_data, found_links = await self.crawl_page(crawler, current_url)
+        # One permit per page still allowed: held while a fetch is in flight and
+        # kept if it produces a page, so the crawl never fetches past max_pages
+        page_budget = asyncio.Semaphore(max(0, max_pages))
+        finished = asyncio.Event()
+        active_workers = 0
 
-                if page_data:
-                    self.results.append(page_data)
+        concurrency = max(1, self.config.get("concurrency", 8))
+        crawl_delay = self.config.get("crawl_delay", 0.5)
 
-                # Add newly found links to crawl queue with validation
-                new_links = found_links - self.crawled_urls
-                valid_new_links = [
-                    link for link in new_links if self.is_valid_url(link)
+        async def worker(crawler: Any) -> None:
+            nonlocal active_workers
+            while True:
+                current_url = await queue.get()
+                active_workers += 1
+                queued_urls.discard(current_url)
+                try:
+                    if current_url in self.crawled_urls:
+                        continue
+                    self.crawled_urls.add(current_url)
+
+                    await page_budget.acquire()
+                    page_data, found_links = await self.crawl_page(crawler, current_url)
+                    if not page_data:
+                        page_budget.release()
+                    else:
+                        self.results.append(page_data)
+                        self.total_words += page_data["word_count"]
+                        if len(self.results) >= max_pages:
+                            finished.set()
+                            return
+
+                    # Add newly found links to crawl queue with validation
+                    added = 0
+                    for link in found_links:
+                        if added == 10:  # Limit new links per page
+                            break
+                        if (
+                            link not in self.crawled_urls
+                            and link not in queued_urls
+                            and self.is_valid_url(link)
+                        ):
+                            queue.put_nowait(link)
+                            queued_urls.add(link)
+                            added += 1
+
+                    # Respectful delay (jittered so workers don't fire in lockstep)
+                    await asyncio.sleep(crawl_delay * random.uniform(0.5, 1.5))
+                finally:
+                    active_workers -= 1
+                    queue.task_done()
+                    # Frontier exhausted and nobody left to add to it
+                    if active_workers == 0 and queue.empty():
+                        finished.set()
+
+        if max_pages < 1:
+            finished.set()
+
+        # Imported here: crawl4ai takes most of a second to import, which
+        # --help and --create-config should not pay for
+        from crawl4ai import AsyncWebCrawler
+
+        # Worker log output is written by a background thread so concurrent
+        # workers never block the event loop on stdout
+        with _queued_logging():
+            async with (
+                AsyncWebCrawler(**crawler_config) as crawler,
+                asyncio.TaskGroup() as workers,
+            ):
+                tasks = [
+                    workers.create_task(worker(crawler)) for _ in range(concurrency)
                 ]
-                for link in valid_new_links[:10]:  # Limit new links per page
-                    if len(self.results) < max_pages:
-                        urls_to_crawl.add(link)
-
-                # Respectful delay
-                await asyncio.sleep(self.config.get("crawl_delay", 0.5))
+                await finished.wait()
+                for task in tasks:
+                    task.cancel()
 
         print("\n🎉 Crawling complete!")
         print(f"✅ Successfully crawled: {len(self.results)} pages")
@@ -614,11 +1086,14 @@ class UniversalDocsCrawler:
             # Extract clean site name from the directory name
             site_name = os.path.basename(output_dir)
 
+        # Aggregates shared by the combined file, metadata and index
+        stats = _compute_stats(results)
+
         # 1. Single comprehensive markdown file for LLM context (optional)
         combined_file = None
         if enable_combined:
             combined_file = os.path.join(output_dir, f"{site_name}_docs_{timestamp}.md")
-            self.create_llm_markdown(results, combined_file, site_name)
+            self.create_llm_markdown(results, combined_file, site_name, stats=stats)
 
         # 2. Structured sections for specific queries (optional)
         sections_dir = None
@@ -630,25 +1105,22 @@ class UniversalDocsCrawler:
         metadata_file = os.path.join(
             output_dir, f"{site_name}_metadata_{timestamp}.json"
         )
-        self.save_metadata(results, metadata_file, site_name)
+        self.save_metadata(results, metadata_file, site_name, stats=stats)
 
         # 4. LLM-friendly index with summaries (optional)
         index_file = None
         if enable_index:
             index_file = os.path.join(output_dir, f"{site_name}_index_{timestamp}.md")
-            self.create_llm_index(results, index_file, site_name)
-
-        # 5. Raw HTML files in separate directory (optional)
-        html_dir = None
-        if save_html:
-            html_dir = os.path.join(output_dir, "html")
-            self.save_raw_html_files(results, html_dir, site_name)
+            self.create_llm_index(results, index_file, site_name, stats=stats)
 
-        # 6. Individual markdown files in separate directory (optional)
-        markdown_dir = None
-        if save_individual_markdown:
-            markdown_dir = os.path.join(output_dir, "markdown")
-            self.save_individual_markdown_files(results, markdown_dir, site_name)
+        # 5./6. Raw HTML and individual markdown files in separate
+        # directories (both optional), written in one pass over the results
+        html_dir = os.path.join(output_dir, "html") if save_html else None
+        markdown_dir = (
+            os.path.join(output_dir, "markdown") if save_individual_markdown else None
+        )
+        if html_dir or markdown_dir:
+            self._save_page_files(results, html_dir, markdown_dir)
 
         # 7. LLM-optimized content chunks (if enabled)
         chunks_dir = None
@@ -667,57 +1139,79 @@ class UniversalDocsCrawler:
         )
 
     def create_llm_markdown(
-        self, results: list[dict[str, Any]], filename: str, site_name: str
+        self,
+        results: list[dict[str, Any]],
+        filename: str,
+        site_name: str,
+        stats: dict[str, Any] | None = None,
     ) -> None:
         """Create a comprehensive markdown file optimized for LLM understanding"""
-        # Sort results logically
-        sorted_results = sorted(
-            results,
-            key=lambda x: (
-                x["path"].count("/"),  # Depth first
-                x["path"],  # Then alphabetically
-                -x["word_count"],  # Then by content richness
-            ),
-        )
-
-        content = f"# {site_name.title()} Documentation\n\n"
-        content += f"**Source:** {self.base_url}\n"
-        content += f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        content += f"**Total Pages:** {len(results)}\n"
-        content += f"**Total Words:** {sum(r['word_count'] for r in results):,}\n"
-        content += "**Coverage:** Complete documentation crawl\n\n"
-
-        # Add table of contents
-        content += "## Table of Contents\n\n"
-        for i, result in enumerate(sorted_results, 1):
-            safe_anchor = re.sub(r"[^\w\-]", "-", result["title"].lower())
-            content += f"{i}. [{result['title']}](#{safe_anchor})\n"
-        content += "\n---\n\n"
-
-        # Add content sections
-        for i, result in enumerate(sorted_results, 1):
-            # Create clear section headers
-            content += f"# {i}. {result['title']}\n\n"
-
-            # Add metadata for context
-            content += f"**Path:** `{result['path']}`\n"
-            if result["description"]:
-                content += f"**Description:** {result['description']}\n"
-            content += f"**Word Count:** {result['word_count']}\n\n"
+        # Sort results logically: depth first, then alphabetically, then by
+        # content richness. Keys are built once per page (decorate-sort-
+        # undecorate); the index breaks full ties so pages are never compared
+        decorated = [
+            (r["path"].count("/"), r["path"], -r["word_count"], i, r)
+            for i, r in enumerate(results)
+        ]
+        decorated.sort()
+        if stats is None:
+            stats = _compute_stats(results)
+        page_words = stats["total_words"]
+        sorted_results = [entry[-1] for entry in decorated]
+
+        # Stream page bodies straight to disk; the combined document is never
+        # held in memory. Character and word totals are tallied per piece for
+        # the summary line.
+        total_chars = 0
+        total_words = 0
+        separator = "\n\n" + "=" * 100 + "\n\n"
+        with _atomic_open(
+            filename, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE
+        ) as f:
+            header = (
+                f"# {site_name.title()} Documentation\n\n"
+                f"**Source:** {self.base_url}\n"
+                f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                f"**Total Pages:** {len(results)}\n"
+                f"**Total Words:** {page_words:,}\n"
+                "**Coverage:** Complete documentation crawl\n\n"
+                # Add table of contents
+                "## Table of Contents\n\n"
+            )
+            total_chars += f.write(header)
+            total_words += len(header.split())
 
-            # Add the cleaned content
-            content += result["markdown"]
+            toc = "".join(
+                f"{i}. [{r['title']}](#{r['title'].lower().translate(_SLUG_TABLE)})\n"
+                for i, r in enumerate(sorted_results, 1)
+            )
+            total_chars += f.write(toc)
+            total_words += len(toc.split())
+            total_chars += f.write("\n---\n\n")
+            total_words += 1
+
+            # Add content sections
+            for i, result in enumerate(sorted_results, 1):
+                # Create clear section headers and metadata for context
+                section_header = (
+                    f"# {i}. {result['title']}\n\n**Path:** `{result['path']}`\n"
+                )
+                if result["description"]:
+                    section_header += f"**Description:** {result['description']}\n"
+                section_header += f"**Word Count:** {result['word_count']}\n\n"
+                total_chars += f.write(section_header)
+                total_words += len(section_header.split())
 
-            # Clear section separator
-            content += "\n\n" + "=" * 100 + "\n\n"
+                # Add the cleaned content (word_count was measured on it)
+                total_chars += f.write(result["markdown"])
+                total_words += result["word_count"]
 
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(content)
+                # Clear section separator
+                total_chars += f.write(separator)
+                total_words += 1
 
         print(f"📄 LLM-optimized markdown saved: {filename}")
-        print(
-            f"📊 Total size: {len(content):,} characters ({len(content.split()):,} words)"
-        )
+        print(f"📊 Total size: {total_chars:,} characters ({total_words:,} words)")
 
     def create_sectioned_files(
         self, results: list[dict[str, Any]], sections_dir: str, site_name: str
@@ -726,41 +1220,51 @@ class UniversalDocsCrawler:
         os.makedirs(sections_dir, exist_ok=True)
 
         # Group by main sections
-        sections: dict[str, list[dict]] = {}
+        sections: dict[str, list[dict]] = defaultdict(list)
         for result in results:
-            path_parts = result["path"].split("/")
-            main_section = path_parts[0] if path_parts[0] else "home"
-
-            if main_section not in sections:
-                sections[main_section] = []
-            sections[main_section].append(result)
+            sections[_section_of(result)].append(result)
 
         for section_name, pages in sections.items():
-            safe_name = re.sub(r"[^\w\-_.]", "_", section_name)
+            safe_name = section_name.translate(_FILENAME_TABLE)
             section_file = os.path.join(sections_dir, f"{safe_name}.md")
 
-            content = f"# {site_name.title()} - {section_name.title()}\n\n"
-            content += f"**Section:** {section_name}\n"
-            content += f"**Pages:** {len(pages)}\n"
-            content += f"**Total Words:** {sum(p['word_count'] for p in pages):,}\n\n"
-
-            for page in sorted(pages, key=lambda x: x["path"]):
-                content += f"## {page['title']}\n\n"
-                if page["description"]:
-                    content += f"*{page['description']}*\n\n"
-                content += page["markdown"]
-                content += "\n\n---\n\n"
+            with _atomic_open(
+                section_file, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE
+            ) as f:
+                f.write(
+                    f"# {site_name.title()} - {section_name.title()}\n\n"
+                    f"**Section:** {section_name}\n"
+                    f"**Pages:** {len(pages)}\n"
+                    f"**Total Words:** {sum(p['word_count'] for p in pages):,}\n\n"
+                )
 
-            with open(section_file, "w", encoding="utf-8") as f:
-                f.write(content)
+                for page in sorted(pages, key=itemgetter("path")):
+                    f.write(f"## {page['title']}\n\n")
+                    if page["description"]:
+                        f.write(f"*{page['description']}*\n\n")
+                    f.write(page["markdown"])
+                    f.write("\n\n---\n\n")
 
         print(f"📁 Section files created in: {sections_dir}")
         print(f"📊 Sections: {', '.join(sections.keys())}")
 
     def save_metadata(
-        self, results: list[dict[str, Any]], filename: str, site_name: str
+        self,
+        results: list[dict[str, Any]],
+        filename: str,
+        site_name: str,
+        stats: dict[str, Any] | None = None,
     ) -> None:
         """Save comprehensive metadata for search and analysis"""
+        if stats is None:
+            stats = _compute_stats(results)
+        sections = stats["sections_set"]
+        pages_total = len(results) + len(self.failed_urls)
+        omitted_fields = (
+            _PAGE_HTML_FIELDS
+            if self.config.get("embed_pages_in_metadata", True)
+            else _PAGE_BODY_FIELDS
+        )
         metadata = {
             "site_info": {
                 "name": site_name,
@@ -771,73 +1275,85 @@ class UniversalDocsCrawler:
             },
             "crawl_stats": {
                 "total_pages": len(results),
-                "total_words": sum(r["word_count"] for r in results),
-                "total_characters": sum(r["content_length"] for r in results),
+                "total_words": stats["total_words"],
+                "total_characters": stats["total_chars"],
                 "failed_urls": len(self.failed_urls),
-                "success_rate": len(results)
-                / (len(results) + len(self.failed_urls))
-                * 100
-                if (len(results) + len(self.failed_urls)) > 0
-                else 0,
+                "success_rate": (
+                    len(results) / pages_total * 100 if pages_total > 0 else 0
+                ),
             },
             "content_analysis": {
-                "avg_words_per_page": sum(r["word_count"] for r in results)
-                / len(results)
-                if results
-                else 0,
-                "longest_page": max(results, key=lambda x: x["word_count"])["title"]
-                if results
-                else "",
-                "sections": list({r["path"].split("/")[0] for r in results}),
-                "total_sections": len({r["path"].split("/")[0] for r in results}),
+                "avg_words_per_page": stats["avg_words"],
+                "longest_page": stats["longest"],
+                "sections": list(sections),
+                "total_sections": len(sections),
             },
-            "pages": results,
+            "pages": [
+                {k: v for k, v in r.items() if k not in omitted_fields} for r in results
+            ],
             "failed_urls": self.failed_urls,
             "config_used": self.config,
         }
 
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        _write_json(filename, metadata)
 
         print(f"📋 Metadata saved: {filename}")
 
     def create_llm_index(
-        self, results: list[dict[str, Any]], filename: str, site_name: str
+        self,
+        results: list[dict[str, Any]],
+        filename: str,
+        site_name: str,
+        stats: dict[str, Any] | None = None,
     ) -> None:
         """Create an LLM-friendly index with summaries"""
-        content = f"# {site_name.title()} Documentation Index\n\n"
-        content += "This index provides a structured overview of all documentation content, optimized for LLM understanding and navigation.\n\n"
-
-        # Statistics
-        content += "## Overview\n\n"
-        content += f"- **Total Pages:** {len(results)}\n"
-        content += f"- **Total Words:** {sum(r['word_count'] for r in results):,}\n"
-        content += f"- **Average Words per Page:** {sum(r['word_count'] for r in results) // len(results) if results else 0:,}\n"
-        content += f"- **Source:** {self.base_url}\n\n"
-
         # Group by sections
-        sections: dict[str, list[dict]] = {}
+        sections: dict[str, list[dict]] = defaultdict(list)
+        section_words: dict[str, int] = defaultdict(int)
         for result in results:
-            section = result["path"].split("/")[0] if result["path"] else "home"
-            if section not in sections:
-                sections[section] = []
+            section = _section_of(result)
             sections[section].append(result)
+            section_words[section] += result["word_count"]
+
+        if stats is None:
+            stats = _compute_stats(results)
+        total_words = stats["total_words"]
+
+        with _atomic_open(
+            filename, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE
+        ) as f:
+            f.write(f"# {site_name.title()} Documentation Index\n\n")
+            f.write(
+                "This index provides a structured overview of all documentation content, optimized for LLM understanding and navigation.\n\n"
+            )
 
-        content += "## Sections\n\n"
-        for section_name, pages in sorted(sections.items()):
-            content += f"### {section_name.title()}\n\n"
-            content += f"**Pages:** {len(pages)} | **Words:** {sum(p['word_count'] for p in pages):,}\n\n"
+            # Statistics
+            f.write("## Overview\n\n")
+            f.write(f"- **Total Pages:** {len(results)}\n")
+            f.write(f"- **Total Words:** {total_words:,}\n")
+            f.write(
+                f"- **Average Words per Page:** {total_words // len(results) if results else 0:,}\n"
+            )
+            f.write(f"- **Source:** {self.base_url}\n\n")
 
-            for page in sorted(pages, key=lambda x: (-x["word_count"], x["title"])):
-                content += f"#### {page['title']}\n"
-                content += f"- **Path:** `{page['path']}`\n"
-                content += f"- **Words:** {page['word_count']:,}\n"
-                if page["description"]:
-                    content += f"- **Summary:** {page['description']}\n"
-                content += f"- **URL:** {page['url']}\n\n"
+            f.write("## Sections\n\n")
+            for section_name, pages in sorted(sections.items()):
+                f.write(f"### {section_name.title()}\n\n")
+                f.write(
+                    f"**Pages:** {len(pages)} | **Words:** {section_words[section_name]:,}\n\n"
+                )
 
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(content)
+                # Two stable C-keyed sorts give (-word_count, title) order
+                # without building a key tuple per page
+                pages.sort(key=itemgetter("title"))
+                pages.sort(key=itemgetter("word_count"), reverse=True)
+                for page in pages:
+                    f.write(f"#### {page['title']}\n")
+                    f.write(f"- **Path:** `{page['path']}`\n")
+                    f.write(f"- **Words:** {page['word_count']:,}\n")
+                    if page["description"]:
+                        f.write(f"- **Summary:** {page['description']}\n")
+                    f.write(f"- **URL:** {page['url']}\n\n")
 
         print(f"📑 LLM index created: {filename}")
 
@@ -845,26 +1361,57 @@ class UniversalDocsCrawler:
         self, results: list[dict[str, Any]], html_dir: str, site_name: str
     ) -> None:
         """Save raw HTML files for each crawled page"""
-        os.makedirs(html_dir, exist_ok=True)
+        self._save_page_files(results, html_dir, None)
 
-        for i, result in enumerate(results, 1):
-            # Create safe filename from URL path
-            url_path = urlparse(result["url"]).path
-            if url_path == "/" or not url_path:
-                safe_filename = "index.html"
-            else:
-                # Convert path to safe filename
-                safe_path = url_path.strip("/").replace("/", "_")
-                safe_filename = re.sub(r"[^\w\-_.]", "_", safe_path)
-                if not safe_filename.endswith(".html"):
-                    safe_filename += ".html"
-
-            # Add number prefix for uniqueness and ordering
-            numbered_filename = f"{i:03d}_{safe_filename}"
-            html_file = os.path.join(html_dir, numbered_filename)
-
-            # Create HTML content with metadata header
-            html_content = f"""<!DOCTYPE html>
+    def save_individual_markdown_files(
+        self, results: list[dict[str, Any]], markdown_dir: str, site_name: str
+    ) -> None:
+        """Save individual markdown files for each crawled page"""
+        self._save_page_files(results, None, markdown_dir)
+
+    def _save_page_files(
+        self,
+        results: list[dict[str, Any]],
+        html_dir: str | None,
+        markdown_dir: str | None,
+    ) -> None:
+        """Write the per-page HTML and/or markdown files in a single pass"""
+        for page_dir in (html_dir, markdown_dir):
+            if page_dir:
+                os.makedirs(page_dir, exist_ok=True)
+
+        writes: list[Future[None]] = []
+        with ThreadPoolExecutor(max_workers=_WRITER_THREADS) as pool:
+            for i, result in enumerate(results, 1):
+                if html_dir:
+                    filename, content = self._raw_html_page(i, result)
+                    html_file = os.path.join(html_dir, filename)
+                    writes.append(pool.submit(_write_text_file, html_file, content))
+                if markdown_dir:
+                    filename, content = self._markdown_page(i, result)
+                    md_file = os.path.join(markdown_dir, filename)
+                    writes.append(pool.submit(_write_text_file, md_file, content))
+
+        for write in writes:
+            write.result()  # Re-raise the first failed write
+
+        if html_dir:
+            print(f"📄 Raw HTML files saved in: {html_dir}")
+            print(f"📊 Created {len(results)} HTML files")
+        if markdown_dir:
+            print(f"📝 Individual markdown files saved in: {markdown_dir}")
+            print(f"📊 Created {len(results)} markdown files")
+
+    @staticmethod
+    def _raw_html_page(i: int, result: dict[str, Any]) -> tuple[str, str]:
+        """File name and HTML document for one page's raw HTML"""
+        # Create safe filename from URL path
+        safe_filename = _safe_path_from_url(result["url"]) or "index"
+        if not safe_filename.endswith(".html"):
+            safe_filename += ".html"
+
+        # Create HTML content with metadata header
+        html_content = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -883,40 +1430,25 @@ class UniversalDocsCrawler:
 </body>
 </html>"""
 
-            with open(html_file, "w", encoding="utf-8") as f:
-                f.write(html_content)
-
-        print(f"📄 Raw HTML files saved in: {html_dir}")
-        print(f"📊 Created {len(results)} HTML files")
-
-    def save_individual_markdown_files(
-        self, results: list[dict[str, Any]], markdown_dir: str, site_name: str
-    ) -> None:
-        """Save individual markdown files for each crawled page"""
-        os.makedirs(markdown_dir, exist_ok=True)
-
-        for i, result in enumerate(results, 1):
-            # Create safe filename from title or URL path
-            if result["title"] and result["title"] != "Documentation":
-                safe_title = re.sub(r"[^\w\-_\s]", "", result["title"])
-                safe_title = re.sub(r"\s+", "_", safe_title.strip())[:50]
-                safe_filename = f"{safe_title}.md"
-            else:
-                # Fallback to URL path
-                url_path = urlparse(result["url"]).path
-                if url_path == "/" or not url_path:
-                    safe_filename = "index.md"
-                else:
-                    safe_path = url_path.strip("/").replace("/", "_")
-                    safe_filename = re.sub(r"[^\w\-_.]", "_", safe_path) + ".md"
-
-            # Add number prefix for uniqueness and ordering
-            numbered_filename = f"{i:03d}_{safe_filename}"
-            md_file = os.path.join(markdown_dir, numbered_filename)
+        # Add number prefix for uniqueness and ordering
+        return f"{i:03d}_{safe_filename}", html_content
+
+    @staticmethod
+    def _markdown_page(i: int, result: dict[str, Any]) -> tuple[str, str]:
+        """File name and frontmatter document for one page's markdown"""
+        # Create safe filename from title or URL path
+        if result["title"] and result["title"] != "Documentation":
+            safe_title = _UNSAFE_TITLE_RE.sub("", result["title"])
+            safe_title = _WHITESPACE_RUN_RE.sub("_", safe_title.strip())[:50]
+            safe_filename = f"{safe_title}.md"
+        else:
+            # Fallback to URL path
+            safe_path = _safe_path_from_url(result["url"]) or "index"
+            safe_filename = f"{safe_path}.md"
 
-            # Create markdown content with frontmatter
-            escaped_description = result.get("description", "").replace('"', '\\"')
-            md_content = f"""---
+        # Create markdown content with frontmatter
+        escaped_description = result.get("description", "").replace('"', '\\"')
+        md_content = f"""---
 title: "{result["title"]}"
 url: "{result["url"]}"
 path: "{result["path"]}"
@@ -940,35 +1472,12 @@ status_code: {result.get("status_code", 200)}
 {result["markdown"]}
 """
 
-            with open(md_file, "w", encoding="utf-8") as f:
-                f.write(md_content)
-
-        print(f"📝 Individual markdown files saved in: {markdown_dir}")
-        print(f"📊 Created {len(results)} markdown files")
+        # Add number prefix for uniqueness and ordering
+        return f"{i:03d}_{safe_filename}", md_content
 
     def create_site_directory(self, base_output_dir: str, url: str) -> str:
         """Create a site-specific directory with overwrite handling"""
-        # Extract site name from URL
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc.lower()
-
-        # Remove common prefixes and get clean site name
-        site_name = domain.replace("www.", "").replace("docs.", "")
-
-        # Handle special cases for common documentation patterns
-        if "." in site_name:
-            parts = site_name.split(".")
-            if len(parts) >= 2:
-                # For domains like caddyserver.com -> caddyserver
-                # For domains like docs.netmaker.io -> netmaker
-                # For domains like opentofu.org -> opentofu
-                if parts[0] in ["docs", "documentation", "help", "api"]:
-                    site_name = parts[1]  # Use second part if first is docs-related
-                else:
-                    site_name = parts[0]  # Use first part for normal domains
-
-        # Clean site name (remove any remaining special characters)
-        site_name = re.sub(r"[^\w\-]", "", site_name)
+        site_name = extract_site_name(url)
 
         # Create the site-specific directory path
         site_dir = os.path.join(base_output_dir, site_name)
@@ -978,24 +1487,30 @@ status_code: {result.get("status_code", 200)}
             print(f"\n📁 Directory already exists: {site_dir}")
             print("📄 This directory contains previous crawl data.")
 
-            while True:
-                response = (
-                    input("❓ Do you want to overwrite it? (y/n): ").lower().strip()
+            # Only ask when someone can answer; scripted and CI runs never
+            # block on input() and keep the old data by default
+            action = self.config.get("on_existing_dir", "prompt")
+            if action == "prompt":
+                action = (
+                    self._prompt_existing_dir() if sys.stdin.isatty() else "timestamp"
                 )
 
-                if response in ["y", "yes"]:
-                    print(f"🗑️ Removing existing directory: {site_dir}")
-                    shutil.rmtree(site_dir)
-                    break
-                elif response in ["n", "no"]:
-                    # Create a new directory with timestamp
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    site_name_new = f"{site_name}_{timestamp}"
-                    site_dir = os.path.join(base_output_dir, site_name_new)
-                    print(f"📂 Creating new directory: {site_dir}")
-                    break
-                else:
-                    print("⚠️ Please enter 'y' for yes or 'n' for no.")
+            if action == "overwrite":
+                print(f"🗑️ Removing existing directory: {site_dir}")
+                shutil.rmtree(site_dir)
+            elif action == "timestamp":
+                # Create a new directory with timestamp
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                site_name_new = f"{site_name}_{timestamp}"
+                site_dir = os.path.join(base_output_dir, site_name_new)
+                print(f"📂 Creating new directory: {site_dir}")
+            elif action == "fail":
+                raise FileExistsError(f"Output directory already exists: {site_dir}")
+            else:
+                raise ValueError(
+                    f"Invalid on_existing_dir {action!r}; expected one of "
+                    f"{', '.join(_EXISTING_DIR_ACTIONS)}"
+                )
 
         # Create the directory
         os.makedirs(site_dir, exist_ok=True)
@@ -1003,68 +1518,88 @@ status_code: {result.get("status_code", 200)}
 
         return site_dir
 
+    @staticmethod
+    def _prompt_existing_dir() -> str:
+        """Ask whether to overwrite an existing output directory"""
+        while True:
+            response = input("❓ Do you want to overwrite it? (y/n): ").lower().strip()
+
+            if response in _YES_ANSWERS:
+                return "overwrite"
+            elif response in _NO_ANSWERS:
+                return "timestamp"
+            else:
+                print("⚠️ Please enter 'y' for yes or 'n' for no.")
+
     def estimate_tokens(self, text: str) -> int:
         """Estimate token count for text (rough approximation: 1 token ≈ 4 characters)"""
-        return len(text) // 4
+        return len(text) // _CHARS_PER_TOKEN
 
     def split_text_semantically(
         self, text: str, max_tokens: int, min_tokens: int = 1000
     ) -> list[str]:
         """Split text at semantic boundaries while respecting token limits"""
         chunks = []
-        current_chunk = ""
+        # The open chunk is kept as pieces plus a running length and joined
+        # once when it is emitted, so growing it never copies the text
+        current_parts: list[str] = []
+        current_chars = 0
 
         # Split by double newlines first (paragraph breaks)
         paragraphs = text.split("\n\n")
 
         for paragraph in paragraphs:
             # Check if adding this paragraph would exceed the limit
-            test_chunk = (
-                current_chunk + "\n\n" + paragraph if current_chunk else paragraph
-            )
+            joined_chars = len(paragraph) + (current_chars + 2 if current_chars else 0)
 
-            if self.estimate_tokens(test_chunk) <= max_tokens:
-                current_chunk = test_chunk
+            if joined_chars // _CHARS_PER_TOKEN <= max_tokens:
+                if current_chars:
+                    current_parts += ("\n\n", paragraph)
+                else:
+                    current_parts = [paragraph]
+                current_chars = joined_chars
             else:
                 # If current chunk has enough content, save it
-                if current_chunk and self.estimate_tokens(current_chunk) >= min_tokens:
-                    chunks.append(current_chunk.strip())
-                    current_chunk = paragraph
+                if current_chars and current_chars // _CHARS_PER_TOKEN >= min_tokens:
+                    chunks.append("".join(current_parts).strip())
+                    current_parts, current_chars = [paragraph], len(paragraph)
                 else:
                     # If paragraph is too long by itself, split by sentences
                     if self.estimate_tokens(paragraph) > max_tokens:
                         # Split by periods, but keep code blocks intact
                         if "```" in paragraph:
                             # Handle code blocks specially
-                            chunks.append(
-                                current_chunk.strip()
-                            ) if current_chunk else None
+                            if current_chars:
+                                chunks.append("".join(current_parts).strip())
                             chunks.append(paragraph)
-                            current_chunk = ""
+                            current_parts, current_chars = [], 0
                         else:
                             # Split by sentences
-                            sentences = re.split(r"(?<=[.!?])\s+", paragraph)
+                            sentences = _SENTENCE_END_RE.split(paragraph)
                             for sentence in sentences:
-                                test_chunk = (
-                                    current_chunk + " " + sentence
-                                    if current_chunk
-                                    else sentence
+                                joined_chars = len(sentence) + (
+                                    current_chars + 1 if current_chars else 0
                                 )
-                                if self.estimate_tokens(test_chunk) <= max_tokens:
-                                    current_chunk = test_chunk
+                                if joined_chars // _CHARS_PER_TOKEN <= max_tokens:
+                                    if current_chars:
+                                        current_parts += (" ", sentence)
+                                    else:
+                                        current_parts = [sentence]
+                                    current_chars = joined_chars
                                 else:
-                                    if current_chunk:
-                                        chunks.append(current_chunk.strip())
-                                    current_chunk = sentence
+                                    if current_chars:
+                                        chunks.append("".join(current_parts).strip())
+                                    current_parts = [sentence]
+                                    current_chars = len(sentence)
                     else:
                         # Paragraph fits, but combined with current chunk it doesn't
-                        if current_chunk:
-                            chunks.append(current_chunk.strip())
-                        current_chunk = paragraph
+                        if current_chars:
+                            chunks.append("".join(current_parts).strip())
+                        current_parts, current_chars = [paragraph], len(paragraph)
 
         # Add remaining content
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        if current_chars:
+            chunks.append("".join(current_parts).strip())
 
         return [chunk for chunk in chunks if chunk.strip()]
 
@@ -1085,40 +1620,43 @@ status_code: {result.get("status_code", 200)}
             "chunks": [],
         }
 
-        # Sort results for logical grouping
-        sorted_results = sorted(
-            results,
-            key=lambda x: (
-                x["path"].count("/"),  # Depth first
-                x["path"],  # Then alphabetically
-            ),
-        )
+        # Sort results for logical grouping: depth first, then alphabetically.
+        # The stable second sort keeps path order within each depth and
+        # compares plain ints and strs instead of key tuples
+        sorted_results = sorted(results, key=itemgetter("path"))
+        sorted_results.sort(key=lambda x: x["path"].count("/"))
 
-        current_chunk_content = ""
+        # Chunk text is collected as parts and joined once when the chunk is
+        # closed; the running character count sizes it without re-joining
+        current_chunk_parts: list[str] = []
+        current_chunk_chars = 0
         current_chunk_topics: list[str] = []
         current_chunk_pages: list[dict[str, Any]] = []
         chunk_number = 1
+        closed_chunks: list[tuple[int, list[str], list[str], list[dict[str, Any]]]] = []
 
         for result in sorted_results:
-            page_content = f"\n\n## {result['title']}\n\n"
-            page_content += f"**URL:** {result['url']}\n"
-            page_content += f"**Path:** `{result['path']}`\n\n"
-            page_content += result["markdown"]
+            page_content = (
+                f"\n\n## {result['title']}\n\n"
+                f"**URL:** {result['url']}\n"
+                f"**Path:** `{result['path']}`\n\n"
+                f"{result['markdown']}"
+            )
 
             # Check if adding this page would exceed chunk size
-            test_content = current_chunk_content + page_content
-            estimated_tokens = self.estimate_tokens(test_content)
+            estimated_tokens = (
+                current_chunk_chars + len(page_content)
+            ) // _CHARS_PER_TOKEN
 
-            if estimated_tokens <= chunk_size or not current_chunk_content:
+            if estimated_tokens <= chunk_size or not current_chunk_parts:
                 # Add to current chunk (add header if this is the first content)
-                if not current_chunk_content:
-                    current_chunk_content = f"# {site_name.title()} Documentation - Chunk {chunk_number}\n\n"
-                    current_chunk_content += f"**Source**: {self.base_url}\n"
-                    current_chunk_content += (
-                        f"**Chunk**: {chunk_number} of [total_chunks_placeholder]\n"
-                    )
+                if not current_chunk_parts:
+                    header = self._chunk_header(site_name, chunk_number)
+                    current_chunk_parts.append(header)
+                    current_chunk_chars += len(header)
 
-                current_chunk_content += page_content
+                current_chunk_parts.append(page_content)
+                current_chunk_chars += len(page_content)
                 current_chunk_topics.append(result["title"])
                 current_chunk_pages.append(
                     {
@@ -1128,43 +1666,21 @@ status_code: {result.get("status_code", 200)}
                     }
                 )
             else:
-                # Save current chunk and start new one
-                if current_chunk_content:
-                    chunk_info = self._create_chunk_info(
+                # Close current chunk and start new one
+                closed_chunks.append(
+                    (
                         chunk_number,
-                        current_chunk_content,
+                        current_chunk_parts,
                         current_chunk_topics,
                         current_chunk_pages,
-                        site_name,
-                    )
-                    chunks.append(chunk_info)
-                    chunk_manifest["chunks"].append(
-                        {
-                            "chunk_number": chunk_number,
-                            "filename": chunk_info["filename"],
-                            "topics": ", ".join(
-                                current_chunk_topics[:3]
-                            ),  # First 3 topics
-                            "page_count": len(current_chunk_pages),
-                            "word_count": sum(
-                                p["word_count"] for p in current_chunk_pages
-                            ),
-                            "estimated_tokens": self.estimate_tokens(
-                                current_chunk_content
-                            ),
-                        }
                     )
+                )
 
                 # Start new chunk
                 chunk_number += 1
-                current_chunk_content = (
-                    f"# {site_name.title()} Documentation - Chunk {chunk_number}\n\n"
-                )
-                current_chunk_content += f"**Source**: {self.base_url}\n"
-                current_chunk_content += (
-                    f"**Chunk**: {chunk_number} of [total_chunks_placeholder]\n"
-                )
-                current_chunk_content += page_content
+                header = self._chunk_header(site_name, chunk_number)
+                current_chunk_parts = [header, page_content]
+                current_chunk_chars = len(header) + len(page_content)
                 current_chunk_topics = [result["title"]]
                 current_chunk_pages = [
                     {
@@ -1175,35 +1691,51 @@ status_code: {result.get("status_code", 200)}
                 ]
 
         # Add final chunk
-        if current_chunk_content:
+        if current_chunk_parts:
+            closed_chunks.append(
+                (
+                    chunk_number,
+                    current_chunk_parts,
+                    current_chunk_topics,
+                    current_chunk_pages,
+                )
+            )
+
+        # Fill in the total in each header part before the single join, so
+        # the chunk bodies are never copied again to patch the placeholder
+        total_chunks = str(len(closed_chunks))
+        for number, parts, topics, pages in closed_chunks:
+            parts[0] = parts[0].replace(_TOTAL_CHUNKS_PLACEHOLDER, total_chunks)
             chunk_info = self._create_chunk_info(
-                chunk_number,
-                current_chunk_content,
-                current_chunk_topics,
-                current_chunk_pages,
-                site_name,
+                number, "".join(parts), topics, pages, site_name
             )
             chunks.append(chunk_info)
-            chunk_manifest["chunks"].append(
-                {
-                    "chunk_number": chunk_number,
-                    "filename": chunk_info["filename"],
-                    "topics": ", ".join(current_chunk_topics[:3]),
-                    "page_count": len(current_chunk_pages),
-                    "word_count": sum(p["word_count"] for p in current_chunk_pages),
-                    "estimated_tokens": self.estimate_tokens(current_chunk_content),
-                }
-            )
+            chunk_manifest["chunks"].append(self._chunk_manifest_entry(chunk_info))
 
-        # Update total chunks count and fix placeholders
         chunk_manifest["total_chunks"] = len(chunks)
-        for chunk in chunks:
-            chunk["content"] = chunk["content"].replace(
-                "[total_chunks_placeholder]", str(len(chunks))
-            )
 
         return chunks, chunk_manifest
 
+    def _chunk_header(self, site_name: str, chunk_number: int) -> str:
+        """Heading block that opens each chunk file"""
+        return (
+            f"# {site_name.title()} Documentation - Chunk {chunk_number}\n\n"
+            f"**Source**: {self.base_url}\n"
+            f"**Chunk**: {chunk_number} of {_TOTAL_CHUNKS_PLACEHOLDER}\n"
+        )
+
+    @staticmethod
+    def _chunk_manifest_entry(chunk_info: dict[str, Any]) -> dict[str, Any]:
+        """Summary of one chunk for chunk_manifest.json"""
+        return {
+            "chunk_number": chunk_info["chunk_number"],
+            "filename": chunk_info["filename"],
+            "topics": ", ".join(chunk_info["topics"][:3]),  # First 3 topics
+            "page_count": len(chunk_info["pages"]),
+            "word_count": chunk_info["word_count"],
+            "estimated_tokens": chunk_info["estimated_tokens"],
+        }
+
     def _create_chunk_info(
         self,
         chunk_number: int,
@@ -1215,7 +1747,7 @@ status_code: {result.get("status_code", 200)}
         """Create chunk information dictionary"""
         # Create safe filename
         main_topic = topics[0] if topics else "content"
-        safe_topic = re.sub(r"[^\w\-_]", "-", main_topic.lower())[:30]
+        safe_topic = main_topic.lower().translate(_SLUG_TABLE)[:30]
         filename = f"{site_name}_chunk_{chunk_number:02d}_{safe_topic}.md"
 
         # Add navigation context to content
@@ -1250,96 +1782,141 @@ status_code: {result.get("status_code", 200)}
         os.makedirs(chunks_dir, exist_ok=True)
 
         # Save individual chunk files
-        for chunk in chunks:
-            chunk_path = os.path.join(chunks_dir, chunk["filename"])
-            with open(chunk_path, "w", encoding="utf-8") as f:
-                f.write(chunk["content"])
+        writes: list[Future[None]] = []
+        with ThreadPoolExecutor(max_workers=_WRITER_THREADS) as pool:
+            for chunk in chunks:
+                chunk_path = os.path.join(chunks_dir, chunk["filename"])
+                writes.append(
+                    pool.submit(_write_text_file, chunk_path, chunk["content"])
+                )
+
+        for write in writes:
+            write.result()  # Re-raise the first failed write
 
         # Save manifest
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         manifest_filename = f"{site_name}_chunk_manifest_{timestamp}.json"
         manifest_path = os.path.join(chunks_dir, manifest_filename)
 
-        with open(manifest_path, "w", encoding="utf-8") as f:
-            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        _write_json(manifest_path, manifest)
 
         return chunks_dir
 
 
+# Written verbatim by create_sample_config: the sample never changes, so it
+# is authored as YAML (with comments) instead of being dumped at runtime
+_SAMPLE_CONFIG_YAML = """\
+crawl_settings:
+  max_pages: 100
+  delay: 1.5
+  crawl_delay: 0.5
+  min_word_count: 20
+  min_content_length: 100
+  headless: true
+  verbose: true
+  page_timeout: 30000  # 30 seconds
+  concurrency: 8  # Pages fetched in parallel
+content_extraction:
+  content_selector: main, .content, .docs-content, article, .markdown-body, .documentation
+  excluded_tags:
+  - nav
+  - header
+  - footer
+  - aside
+  - script
+  - style
+  - noscript
+  - iframe
+  - form
+  - button
+url_patterns:
+  include: []  # Will be auto-detected if not specified
+  exclude:
+  - .*/login.*
+  - .*/register.*
+  - .*/signup.*
+  - .*/cart.*
+  - .*/checkout.*
+  - .*/account.*
+  - .*\\.(pdf|zip|tar|gz|exe|dmg|pkg)$
+  - .*#.*
+  - .*\\?.*page=.*
+  - .*\\$\\{.*\\}.*  # Template variables
+  - .*\\{\\{.*\\}\\}.*  # Handlebars templates
+output:
+  site_name: auto  # Will be auto-detected
+  output_dir: crawled_docs  # Base directory - site-specific subdirectories will be created
+  embed_pages_in_metadata: true  # false keeps page bodies out of metadata JSON
+  on_existing_dir: prompt  # prompt, overwrite, timestamp or fail
+chunk_settings:
+  chunk_size: 4000  # Target tokens per chunk
+  min_chunk_size: 1000  # Minimum chunk size
+  max_chunk_size: 6000  # Maximum chunk size
+  preserve_code_blocks: true  # Don't split code examples
+  include_navigation: true  # Add prev/next chunk references
+  semantic_splitting: true  # Split at headers, not arbitrary points
+"""
+
+
 def create_sample_config() -> None:
     """Create a sample configuration file"""
-    import yaml
-
-    config = {
-        "crawl_settings": {
-            "max_pages": 100,
-            "delay": 1.5,
-            "crawl_delay": 0.5,
-            "min_word_count": 20,
-            "min_content_length": 100,
-            "headless": True,
-            "verbose": True,
-            "page_timeout": 30000,  # 30 seconds
-        },
-        "content_extraction": {
-            "content_selector": "main, .content, .docs-content, article, .markdown-body, .documentation",
-            "excluded_tags": [
-                "nav",
-                "header",
-                "footer",
-                "aside",
-                "script",
-                "style",
-                "noscript",
-                "iframe",
-                "form",
-                "button",
-            ],
-        },
-        "url_patterns": {
-            "include": [
-                # Will be auto-detected if not specified
-            ],
-            "exclude": [
-                r".*/login.*",
-                r".*/register.*",
-                r".*/signup.*",
-                r".*/cart.*",
-                r".*/checkout.*",
-                r".*/account.*",
-                r".*\.(pdf|zip|tar|gz|exe|dmg|pkg)$",
-                r".*#.*",
-                r".*\?.*page=.*",
-                r".*\$\{.*\}.*",  # Template variables
-                r".*\{\{.*\}\}.*",  # Handlebars templates
-            ],
-        },
-        "output": {
-            "site_name": "auto",  # Will be auto-detected
-            "output_dir": "crawled_docs",  # Base directory - site-specific subdirectories will be created
-        },
-        "chunk_settings": {
-            "chunk_size": 4000,  # Target tokens per chunk
-            "min_chunk_size": 1000,  # Minimum chunk size
-            "max_chunk_size": 6000,  # Maximum chunk size
-            "preserve_code_blocks": True,  # Don't split code examples
-            "include_navigation": True,  # Add prev/next chunk references
-            "semantic_splitting": True,  # Split at headers, not arbitrary points
-        },
-    }
-
-    with open("crawler_config.yaml", "w") as f:
-        yaml.dump(config, f, default_flow_style=False, indent=2)
+    with open("crawler_config.yaml", "w", encoding="utf-8") as f:
+        f.write(_SAMPLE_CONFIG_YAML)
 
     print("📋 Sample config created: crawler_config.yaml")
 
 
-async def main() -> None:
-    import argparse
-    import json
+# Sections of the sample config; the crawler reads their keys at top level
+_CONFIG_SECTIONS = ("crawl_settings", "content_extraction", "output", "chunk_settings")
+
 
-    import yaml
+def _flatten_config_sections(config: dict[str, Any]) -> dict[str, Any]:
+    """Lift the keys of the sample config's sections to the top level
 
+    A key set at the top level directly wins over the same key in a section.
+    """
+    flat: dict[str, Any] = {}
+    for section in _CONFIG_SECTIONS:
+        if isinstance(config.get(section), dict):
+            flat.update(config[section])
+    for key, value in config.items():
+        if key not in _CONFIG_SECTIONS or not isinstance(value, dict):
+            flat[key] = value
+    return flat
+
+
+def _load_config(path: str) -> dict[str, Any]:
+    """Read a YAML or JSON configuration file
+
+    Malformed files raise ValueError (JSON decode errors already are one),
+    as do files whose top level is not a mapping, such as an empty YAML file.
+    """
+    if path.endswith((".yaml", ".yml")):
+        import yaml
+
+        with open(path, encoding="utf-8") as f:
+            try:
+                # libyaml's C parser when PyYAML was built with it
+                config = yaml.load(
+                    f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+                )
+            except yaml.YAMLError as e:
+                raise ValueError(e) from e
+    elif orjson is not None:
+        with open(path, "rb") as f:
+            config = orjson.loads(f.read())
+    else:
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+
+    if not isinstance(config, dict):
+        raise ValueError("config must be a mapping")
+    return config
+
+
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Command line parser, built once and reused across main() calls"""
     parser = argparse.ArgumentParser(
         description="Universal Documentation Crawler for LLM Training"
     )
@@ -1348,6 +1925,11 @@ async def main() -> None:
     parser.add_argument(
         "--max-pages", "-m", type=int, default=50, help="Maximum pages to crawl"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Pages fetched in parallel (default: config value or 8)",
+    )
     parser.add_argument(
         "--output-dir",
         "-o",
@@ -1401,14 +1983,46 @@ async def main() -> None:
         action="store_true",
         help="Enable creation of index/overview file (disabled by default)",
     )
+    existing_dir = parser.add_mutually_exclusive_group()
+    existing_dir.add_argument(
+        "--overwrite",
+        "--yes",
+        "-y",
+        action="store_true",
+        help="Overwrite an existing site output directory without asking",
+    )
+    existing_dir.add_argument(
+        "--keep-existing",
+        "--no",
+        action="store_true",
+        help="Keep an existing site output directory and write to a timestamped one",
+    )
     parser.add_argument(
         "--create-config", action="store_true", help="Create sample configuration file"
     )
 
-    args = parser.parse_args()
+    return parser
+
+
+async def _load_cli_config(path: str | None) -> dict[str, Any]:
+    """Load the --config file if given, reporting rather than raising errors"""
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        # Parsing runs on a worker thread; YAML has no async parser
+        config = await asyncio.to_thread(_load_config, path)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Could not load config: {e}")
+        return {}
+    print(f"📋 Loaded config from {path}")
+    return _flatten_config_sections(config)
+
+
+async def main() -> None:
+    args = _build_parser().parse_args()
 
     if args.create_config:
-        create_sample_config()
+        await asyncio.to_thread(create_sample_config)
         return
 
     if not args.url:
@@ -1427,34 +2041,40 @@ async def main() -> None:
         print("💡 For help: crawl4dev --help")
         return
 
-    # Check and install Playwright browsers if needed
-    if not check_and_install_playwright():
+    # Check and install Playwright browsers if needed, loading the config
+    # file alongside; both block on worker threads and are independent
+    browsers_ready, config = await asyncio.gather(
+        asyncio.to_thread(check_and_install_playwright),
+        _load_cli_config(args.config),
+    )
+    if not browsers_ready:
         print("❌ Failed to setup Playwright browsers. Cannot continue.")
         print("💡 Try running 'playwright install chromium' manually.")
         return
 
-    # Initialize crawler
-    config = {}
-
-    # Load configuration if provided
-    if args.config and os.path.exists(args.config):
-        try:
-            with open(args.config) as f:
-                if args.config.endswith((".yaml", ".yml")):
-                    import yaml
-
-                    config = yaml.safe_load(f)
-                else:
-                    config = json.load(f)
-            print(f"📋 Loaded config from {args.config}")
-        except Exception as e:
-            print(f"⚠️  Could not load config: {e}")
-
     # Override config with command line arguments
     if args.max_pages:
         config["max_pages"] = args.max_pages
-
-    crawler = UniversalDocsCrawler(config)
+    if args.concurrency:
+        config["concurrency"] = args.concurrency
+    if args.overwrite:
+        config["on_existing_dir"] = "overwrite"
+    elif args.keep_existing:
+        config["on_existing_dir"] = "timestamp"
+
+    # Determine output format options
+    save_html = (
+        args.enable_html and not args.no_html
+    )  # Only save HTML if explicitly enabled
+    save_individual_markdown = not args.no_markdown
+
+    # Handle --html-only flag (override individual markdown saving)
+    if args.html_only:
+        save_individual_markdown = False
+        save_html = True
+
+    # Raw HTML is only held in memory when it will be written out
+    crawler = UniversalDocsCrawler(config, keep_raw_html=save_html)
 
     print("🌐 Universal Documentation Crawler")
     print(f"🎯 Target: {args.url}")
@@ -1462,155 +2082,179 @@ async def main() -> None:
     print(f"📁 Output: {args.output_dir}")
 
     # Perform the crawl
-    results = await crawler.deep_crawl(args.url, args.max_pages)
+    try:
+        results = await crawler.deep_crawl(args.url, args.max_pages)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
 
     if results:
         # Save results
-        site_name = args.site_name or urlparse(args.url).netloc.replace("www.", "")
+        site_name = args.site_name or _urlsplit(args.url).netloc.removeprefix("www.")
         enable_chunking = args.enable_chunking
         enable_sections = args.enable_sections
         enable_combined = args.enable_combined
         enable_index = args.enable_index
 
-        # Determine output format options
-        save_html = (
-            args.enable_html and not args.no_html
-        )  # Only save HTML if explicitly enabled
-        save_individual_markdown = not args.no_markdown
-
-        # Handle --html-only flag (override individual markdown saving)
-        if args.html_only:
-            save_individual_markdown = False
-            save_html = True
-
-        (
-            combined_file,
-            metadata_file,
-            index_file,
-            sections_dir,
-            chunks_dir,
-            html_dir,
-            markdown_dir,
-        ) = crawler.save_llm_optimized_results(
-            results,
-            args.output_dir,
-            site_name,
-            enable_chunking=enable_chunking,
-            chunk_size=args.chunk_size,
-            save_html=save_html,
-            save_individual_markdown=save_individual_markdown,
-            enable_sections=enable_sections,
-            enable_combined=enable_combined,
-            enable_index=enable_index,
-        )
+        try:
+            (
+                combined_file,
+                metadata_file,
+                index_file,
+                sections_dir,
+                chunks_dir,
+                html_dir,
+                markdown_dir,
+            ) = await asyncio.to_thread(
+                crawler.save_llm_optimized_results,
+                results,
+                args.output_dir,
+                site_name,
+                enable_chunking=enable_chunking,
+                chunk_size=args.chunk_size,
+                save_html=save_html,
+                save_individual_markdown=save_individual_markdown,
+                enable_sections=enable_sections,
+                enable_combined=enable_combined,
+                enable_index=enable_index,
+            )
+        except FileExistsError as e:
+            print(f"❌ {e}")
+            return
 
-        print("\n🎉 Crawling completed successfully!")
+        # The summary is written in one call so it reaches the terminal as a block
+        out: list[str] = []
+        out.append("\n🎉 Crawling completed successfully!")
         # Use output_dir or derive from metadata_file since those are always created
         site_directory = os.path.dirname(metadata_file)
-        print(f"📁 Site directory: {site_directory}")
+        out.append(f"📁 Site directory: {site_directory}")
 
         if combined_file:
-            print(f"📄 Combined file: {combined_file}")
+            out.append(f"📄 Combined file: {combined_file}")
         else:
-            print("📄 Combined file: Disabled (use --enable-combined to enable)")
+            out.append("📄 Combined file: Disabled (use --enable-combined to enable)")
 
         if sections_dir:
-            print(f"📂 Sections: {sections_dir}")
+            out.append(f"📂 Sections: {sections_dir}")
         else:
-            print("📂 Sections: Disabled (use --enable-sections to enable)")
+            out.append("📂 Sections: Disabled (use --enable-sections to enable)")
 
-        print(f"📋 Metadata: {metadata_file}")
+        out.append(f"📋 Metadata: {metadata_file}")
 
         if index_file:
-            print(f"📑 Index: {index_file}")
+            out.append(f"📑 Index: {index_file}")
         else:
-            print("📑 Index: Disabled (use --enable-index to enable)")
+            out.append("📑 Index: Disabled (use --enable-index to enable)")
 
         if html_dir:
-            print(f"🌐 Raw HTML: {html_dir}")
+            out.append(f"🌐 Raw HTML: {html_dir}")
         else:
-            print("🌐 Raw HTML: Disabled (use --enable-html to enable)")
+            out.append("🌐 Raw HTML: Disabled (use --enable-html to enable)")
 
         if markdown_dir:
-            print(f"📝 Individual Markdown: {markdown_dir}")
+            out.append(f"📝 Individual Markdown: {markdown_dir}")
         else:
-            print("📝 Individual Markdown: Disabled (use --no-markdown to re-enable)")
+            out.append(
+                "📝 Individual Markdown: Disabled (use --no-markdown to re-enable)"
+            )
 
         if chunks_dir:
-            print(f"🤖 LLM Chunks: {chunks_dir}")
+            out.append(f"🤖 LLM Chunks: {chunks_dir}")
             # Count chunk files
-            chunk_files = [f for f in os.listdir(chunks_dir) if f.endswith(".md")]
-            print(f"   Created {len(chunk_files)} optimized chunks for LLM consumption")
+            with os.scandir(chunks_dir) as entries:
+                chunk_count = sum(
+                    1 for e in entries if e.name.endswith(".md") and e.is_file()
+                )
+            out.append(f"   Created {chunk_count} optimized chunks for LLM consumption")
         else:
-            print("🤖 LLM Chunks: Disabled (use --enable-chunking to enable)")
+            out.append("🤖 LLM Chunks: Disabled (use --enable-chunking to enable)")
 
         # Show statistics
-        total_words = sum(r["word_count"] for r in results)
-        print("\n📊 Final Statistics:")
-        print(f"✅ Pages crawled: {len(results)}")
-        print(f"📝 Total words: {total_words:,}")
-        print(
-            f"📄 Average words/page: {total_words // len(results) if results else 0:,}"
-        )
-        print(
-            f"🎯 Success rate: {len(results) / (len(results) + len(crawler.failed_urls)) * 100 if (len(results) + len(crawler.failed_urls)) > 0 else 100:.1f}%"
+        total_words = crawler.total_words
+        pages_ok = len(results)
+        pages_total = pages_ok + len(crawler.failed_urls)
+        success_rate = pages_ok / pages_total * 100 if pages_total else 100
+        out.append("\n📊 Final Statistics:")
+        out.append(f"✅ Pages crawled: {pages_ok}")
+        out.append(f"📝 Total words: {total_words:,}")
+        out.append(
+            f"📄 Average words/page: {total_words // pages_ok if pages_ok else 0:,}"
         )
+        out.append(f"🎯 Success rate: {success_rate:.1f}%")
 
-        print("\n🤖 LLM Usage Tips:")
+        out.append("\n🤖 LLM Usage Tips:")
 
         if combined_file:
             if chunks_dir:
-                print(
+                out.append(
                     f"• Use chunks in '{chunks_dir}' for LLM consumption (size: {args.chunk_size} tokens)"
                 )
-                print(
+                out.append(
                     f"• Use '{combined_file}' for comprehensive context (may be too large for some LLMs)"
                 )
             else:
-                print(f"• Use '{combined_file}' for comprehensive context")
+                out.append(f"• Use '{combined_file}' for comprehensive context")
         else:
-            print(
+            out.append(
                 "• Individual markdown files in 'markdown/' directory are optimized for LLM consumption"
             )
             if chunks_dir:
-                print(
+                out.append(
                     f"• Use chunks in '{chunks_dir}' for LLM consumption (size: {args.chunk_size} tokens)"
                 )
             else:
-                print(
+                out.append(
                     "• Enable chunking with --enable-chunking for LLM-optimized content"
                 )
 
         if markdown_dir:
-            print(
+            out.append(
                 f"• Individual markdown files in '{markdown_dir}' for granular access"
             )
 
         if sections_dir:
-            print(f"• Use files in '{sections_dir}' for specific topics")
+            out.append(f"• Use files in '{sections_dir}' for specific topics")
         else:
-            print("• Enable sections with --enable-sections for topic-specific files")
+            out.append(
+                "• Enable sections with --enable-sections for topic-specific files"
+            )
 
         if index_file:
-            print(f"• Check '{index_file}' for content overview")
+            out.append(f"• Check '{index_file}' for content overview")
         else:
-            print("• Enable index with --enable-index for content overview")
+            out.append("• Enable index with --enable-index for content overview")
 
         if html_dir:
-            print(f"• Raw HTML files available in '{html_dir}' for debugging/analysis")
+            out.append(
+                f"• Raw HTML files available in '{html_dir}' for debugging/analysis"
+            )
         if not html_dir:
-            print("• Enable HTML output with --enable-html for debugging/analysis")
+            out.append("• Enable HTML output with --enable-html for debugging/analysis")
         if chunks_dir:
-            print("• Each chunk is self-contained and ready for copy-paste into LLMs")
+            out.append(
+                "• Each chunk is self-contained and ready for copy-paste into LLMs"
+            )
+
+        sys.stdout.write("\n".join(out) + "\n")
 
     else:
         print("❌ No content was crawled successfully")
         print("💡 Try adjusting the URL patterns or checking the site structure")
 
 
+def _event_loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """Return uvloop's loop factory when installed, else None (stdlib loop)"""
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
 def cli_main() -> None:
     """Synchronous entry point for the CLI console script."""
-    asyncio.run(main())
+    with asyncio.Runner(loop_factory=_event_loop_factory()) as runner:
+        runner.run(main())
 
 
 if __name__ == "__main__":
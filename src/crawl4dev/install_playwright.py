@@ -15,12 +15,13 @@ def install_playwright_browsers() -> bool:
     print("This is a one-time setup that may take a few minutes...")
 
     try:
-        # Install Chromium browser for Playwright
+        # Install Chromium browser for Playwright; the progress output is
+        # discarded rather than buffered, only stderr is kept for errors
         subprocess.run(
             [sys.executable, "-m", "playwright", "install", "chromium"],
             check=True,
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
         )
 
         print("✅ Playwright browser installation completed successfully!")
@@ -29,7 +30,7 @@ def install_playwright_browsers() -> bool:
 
     except subprocess.CalledProcessError as e:
         print(f"❌ Failed to install Playwright browsers: {e}")
-        print(f"   Error output: {e.stderr}")
+        print(f"   Error output: {e.stderr.decode('utf-8', 'replace')}")
         print("⚠️  You may need to run 'playwright install chromium' manually.")
         return False
     except FileNotFoundError:
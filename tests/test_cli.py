@@ -1,7 +1,9 @@
 """Test command-line interface functionality."""
 
 import sys
-from unittest.mock import patch
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -37,6 +39,43 @@ class TestCommandLineInterface:
 
         # If this doesn't raise an ImportError, the module is properly set up
 
+    @pytest.mark.parametrize(
+        "sync_api",
+        [
+            None,  # Playwright not installed: the import fails
+            SimpleNamespace(sync_playwright=MagicMock(side_effect=RuntimeError)),
+        ],
+    )
+    def test_playwright_probe_failure_installs(self, sync_api: object) -> None:
+        """Test a missing or broken Playwright falls through to the install."""
+        from crawl4dev.crawler import check_and_install_playwright
+
+        with (
+            patch.dict(sys.modules, {"playwright.sync_api": sync_api}),
+            patch("crawl4dev.crawler.subprocess.run") as mock_run,
+        ):
+            assert check_and_install_playwright()
+
+        mock_run.assert_called_once()
+
+    def test_playwright_probe_timeout_installs(self) -> None:
+        """Test a hung Playwright probe falls through to the install."""
+        from crawl4dev.crawler import check_and_install_playwright
+
+        release = threading.Event()
+        with (
+            patch("crawl4dev.crawler._PLAYWRIGHT_PROBE_TIMEOUT", 0.01),
+            patch(
+                "crawl4dev.crawler._probe_chromium_path",
+                side_effect=lambda found: release.wait(5),
+            ),
+            patch("crawl4dev.crawler.subprocess.run") as mock_run,
+        ):
+            assert check_and_install_playwright()
+        release.set()
+
+        mock_run.assert_called_once()
+
 
 class TestPackageStructure:
     """Test package structure and imports."""
@@ -45,7 +84,12 @@ class TestPackageStructure:
         """Test that __all__ exports work correctly."""
         from crawl4dev import __all__
 
-        expected_exports = ["UniversalDocsCrawler", "create_sample_config", "main"]
+        expected_exports = [
+            "UniversalDocsCrawler",
+            "create_sample_config",
+            "extract_site_name",
+            "main",
+        ]
         assert set(__all__) == set(expected_exports)
 
     def test_direct_imports(self) -> None:
@@ -6,8 +6,9 @@ Tests core components that don't require external crawl4ai dependency
 
 import os
 import sys
-import tempfile
-from urllib.parse import urlparse
+from pathlib import Path
+
+import pytest
 
 # Add current directory to path to import our main module
 sys.path.insert(0, ".")
@@ -37,12 +38,7 @@ def test_url_parsing() -> None:
     """Test URL parsing and site name extraction"""
     print("\n🧪 Testing URL parsing and site name extraction...")
 
-    # Import the class
-    try:
-        from crawl4dev.crawler import UniversalDocsCrawler
-    except ImportError as e:
-        print(f"❌ Could not import UniversalDocsCrawler: {e}")
-        assert False, f"Could not import UniversalDocsCrawler: {e}"
+    from crawl4dev.crawler import extract_site_name
 
     # Test site name extraction logic
     test_cases = [
@@ -53,24 +49,8 @@ def test_url_parsing() -> None:
         ("https://api.github.com/docs/", "github"),
     ]
 
-    UniversalDocsCrawler()
-
     for url, expected in test_cases:
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc.lower()
-        site_name = domain.replace("www.", "").replace("docs.", "")
-
-        if "." in site_name:
-            parts = site_name.split(".")
-            if len(parts) >= 2:
-                if parts[0] in ["docs", "documentation", "help", "api"]:
-                    site_name = parts[1]
-                else:
-                    site_name = parts[0]
-
-        import re
-
-        site_name = re.sub(r"[^\w\-]", "", site_name)
+        site_name = extract_site_name(url)
 
         if site_name == expected:
             print(f"✅ {url} → {site_name}")
@@ -84,41 +64,28 @@ def test_url_parsing() -> None:
     assert True
 
 
-def test_directory_creation() -> None:
+def test_directory_creation(tmp_path: Path) -> None:
     """Test directory creation logic without user interaction"""
     print("\n🧪 Testing directory creation logic...")
 
     try:
-        from crawl4dev.crawler import UniversalDocsCrawler
-
-        # Create a temporary base directory
-        with tempfile.TemporaryDirectory() as temp_dir:
-            UniversalDocsCrawler()
-
-            # Test URL parsing for directory creation
-            test_url = "https://caddyserver.com/docs/"
-            parsed_url = urlparse(test_url)
-            domain = parsed_url.netloc.lower()
-            site_name = domain.replace("www.", "").replace("docs.", "")
-
-            if "." in site_name:
-                parts = site_name.split(".")
-                if len(parts) >= 2:
-                    site_name = parts[0]
+        from crawl4dev.crawler import UniversalDocsCrawler, extract_site_name
 
-            import re
+        UniversalDocsCrawler()
 
-            site_name = re.sub(r"[^\w\-]", "", site_name)
+        # Test URL parsing for directory creation
+        test_url = "https://caddyserver.com/docs/"
+        site_name = extract_site_name(test_url)
 
-            # Create expected directory path
-            os.path.join(temp_dir, site_name)
+        # Create expected directory path
+        os.path.join(tmp_path, site_name)
 
-            # Test that directory would be created correctly
-            if site_name == "caddyserver":
-                print("✅ Directory name extraction: PASSED")
-            else:
-                print(f"❌ Expected 'caddyserver', got '{site_name}'")
-                assert False, f"Expected 'caddyserver', got '{site_name}'"
+        # Test that directory would be created correctly
+        if site_name == "caddyserver":
+            print("✅ Directory name extraction: PASSED")
+        else:
+            print(f"❌ Expected 'caddyserver', got '{site_name}'")
+            assert False, f"Expected 'caddyserver', got '{site_name}'"
 
         print("✅ Directory creation logic: PASSED")
         assert True
@@ -128,45 +95,29 @@ def test_directory_creation() -> None:
         assert False, f"Directory creation test failed: {e}"
 
 
-def test_url_validation() -> None:
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("https://example.com/docs/guide", True),
+        ("https://other.com/docs/guide", False),  # Different domain
+        ("https://example.com/login", False),  # Excluded pattern
+        ("https://example.com/docs/${var}/test", False),  # Template variable
+        ("", False),  # Empty URL
+        (None, False),  # None URL
+    ],
+)
+def test_url_validation(url: str | None, expected: bool) -> None:
     """Test URL validation logic"""
-    print("\n🧪 Testing URL validation...")
-
-    try:
-        from crawl4dev.crawler import UniversalDocsCrawler
-
-        crawler = UniversalDocsCrawler()
-        crawler.domain = "https://example.com"
-        crawler.url_patterns = {
-            "include": [r".*/docs/.*"],
-            "exclude": [r".*/login.*", r".*\$\{.*\}.*"],
-        }
-
-        test_cases = [
-            ("https://example.com/docs/guide", True),
-            ("https://other.com/docs/guide", False),  # Different domain
-            ("https://example.com/login", False),  # Excluded pattern
-            ("https://example.com/docs/${var}/test", False),  # Template variable
-            ("", False),  # Empty URL
-            (None, False),  # None URL
-        ]
-
-        for url, expected in test_cases:
-            result = crawler.is_valid_url(url) if url else False
-            if result == expected:
-                print(f"✅ {url} → {result}")
-            else:
-                print(f"❌ {url} → {result} (expected {expected})")
-                assert False, (
-                    f"URL validation failed for {url}: got {result}, expected {expected}"
-                )
+    from crawl4dev.crawler import UniversalDocsCrawler
 
-        print("✅ URL validation: PASSED")
-        assert True
+    crawler = UniversalDocsCrawler()
+    crawler.domain = "https://example.com"
+    crawler.url_patterns = {
+        "include": [r".*/docs/.*"],
+        "exclude": [r".*/login.*", r".*\$\{.*\}.*"],
+    }
 
-    except Exception as e:
-        print(f"❌ URL validation test failed: {e}")
-        assert False, f"URL validation test failed: {e}"
+    assert crawler.is_valid_url(url) == expected
 
 
 def test_markdown_cleaning() -> None:
@@ -255,7 +206,7 @@ First, install the software...
         assert False, f"Title extraction test failed: {e}"
 
 
-def test_config_creation() -> None:
+def test_config_creation(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     """Test configuration file creation"""
     print("\n🧪 Testing config creation...")
 
@@ -263,23 +214,10 @@ def test_config_creation() -> None:
         from crawl4dev.crawler import create_sample_config
 
         # Test in temporary directory
-        with tempfile.TemporaryDirectory() as temp_dir:
-            original_cwd = os.getcwd()
-            os.chdir(temp_dir)
-
-            try:
-                # This will fail due to yaml import, but we can test the structure
-                create_sample_config()
-            except Exception as e:
-                if "yaml" in str(e).lower():
-                    print(
-                        "✅ Config creation function exists (yaml import expected to fail)"
-                    )
-                    assert True
-                else:
-                    raise e
-            finally:
-                os.chdir(original_cwd)
+        monkeypatch.chdir(tmp_path)
+        create_sample_config()
+        assert (tmp_path / "crawler_config.yaml").exists()
+        print("✅ Config creation: PASSED")
 
     except Exception as e:
         print(f"❌ Config creation test failed: {e}")
@@ -299,49 +237,3 @@ def test_command_line_parsing() -> None:
     except Exception as e:
         print(f"❌ Command line parsing test failed: {e}")
         assert False, f"Command line parsing test failed: {e}"
-
-
-def run_all_tests() -> bool:
-    """Run all tests and report results"""
-    print("🚀 Starting comprehensive test suite for main.py")
-    print("=" * 60)
-
-    tests = [
-        test_imports,
-        test_url_parsing,
-        test_directory_creation,
-        test_url_validation,
-        test_markdown_cleaning,
-        test_title_extraction,
-        test_config_creation,
-        test_command_line_parsing,
-    ]
-
-    passed = 0
-    total = len(tests)
-
-    for test in tests:
-        try:
-            test()  # These functions now return None, just call them
-            passed += 1
-        except (AssertionError, Exception) as e:
-            print(f"❌ Test {test.__name__} failed: {e}")
-
-    print("\n" + "=" * 60)
-    print(f"📊 TEST RESULTS: {passed}/{total} tests passed")
-
-    if passed == total:
-        print("🎉 ALL TESTS PASSED! The core functionality is working correctly.")
-        print(
-            "\n📝 Note: External dependencies (crawl4ai, yaml) are expected to be missing"
-        )
-        print("   but all core logic and functionality has been verified.")
-        return True
-    else:
-        print(f"⚠️  {total - passed} test(s) failed. Please review the issues above.")
-        return False
-
-
-if __name__ == "__main__":
-    success = run_all_tests()
-    sys.exit(0 if success else 1)
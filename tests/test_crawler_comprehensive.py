@@ -1,14 +1,62 @@
 """Comprehensive test suite for crawl4dev crawler functionality."""
 
+import logging
 import os
-import tempfile
-from unittest.mock import AsyncMock, MagicMock, patch
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
 
 import pytest
-import respx
-from httpx import Response
+import yaml
+
+from crawl4dev.crawler import (
+    UniversalDocsCrawler,
+    _load_cli_config,
+    _load_config,
+    _queued_logging,
+    create_sample_config,
+)
+from crawl4dev.crawler import logger as crawler_logger
+
+_TEST_PAGE_MARKDOWN = (
+    "# Test Page\n\nThis is test content with good information. "
+    "This page contains detailed documentation about the testing framework "
+    "and provides comprehensive examples for developers to understand "
+    "the implementation details and best practices."
+)
+_HOME_MARKDOWN = (
+    "# Home\n\nWelcome to our comprehensive documentation portal. "
+    "This site contains detailed guides, tutorials, and reference "
+    "materials to help you get started with our platform and "
+    "understand all features."
+)
+_GUIDE_MARKDOWN = (
+    "# Guide\n\nThis detailed guide provides step-by-step "
+    "instructions for using our platform effectively. It covers "
+    "installation, configuration, and advanced usage patterns with "
+    "comprehensive examples."
+)
+
+
+def _make_result(
+    markdown: str, *, success: bool = True, html: str = "", status_code: int = 200
+) -> SimpleNamespace:
+    """Stand-in for a crawl4ai result with the attributes crawl_page reads."""
+    return SimpleNamespace(
+        success=success, markdown=markdown, html=html, status_code=status_code
+    )
+
+
+@pytest.fixture
+def crawler() -> UniversalDocsCrawler:
+    """Fresh crawler with the default (empty) config."""
+    return UniversalDocsCrawler()
 
-from crawl4dev.crawler import UniversalDocsCrawler, create_sample_config
+
+@pytest.fixture(scope="module")
+def long_markdown() -> str:
+    """Very long single-paragraph markdown document, built once per module."""
+    return "# Title\n\n" + "This is a very long paragraph. " * 1000
 
 
 class TestUniversalDocsCrawler:
@@ -30,9 +78,8 @@ class TestUniversalDocsCrawler:
         crawler = UniversalDocsCrawler(config)
         assert crawler.config == config
 
-    def test_setup_for_website(self) -> None:
+    def test_setup_for_website(self, crawler: UniversalDocsCrawler) -> None:
         """Test website setup functionality."""
-        crawler = UniversalDocsCrawler()
         test_url = "https://docs.example.com/guide/"
 
         crawler.setup_for_website(test_url)
@@ -41,6 +88,13 @@ class TestUniversalDocsCrawler:
         assert crawler.domain == "https://docs.example.com"
         assert "include" in crawler.url_patterns
 
+    def test_setup_rejects_invalid_pattern(self) -> None:
+        """Test malformed configured URL patterns fail at setup time."""
+        crawler = UniversalDocsCrawler({"url_patterns": {"include": ["(docs"]}})
+
+        with pytest.raises(ValueError, match="include URL pattern"):
+            crawler.setup_for_website("https://example.com/docs/")
+
     @pytest.mark.parametrize(
         "url,expected_patterns",
         [
@@ -50,9 +104,10 @@ class TestUniversalDocsCrawler:
             ("https://example.com/help/", [".*help.*"]),
         ],
     )
-    def test_auto_detect_patterns(self, url: str, expected_patterns: list[str]) -> None:
+    def test_auto_detect_patterns(
+        self, url: str, expected_patterns: list[str], crawler: UniversalDocsCrawler
+    ) -> None:
         """Test automatic pattern detection for different URL types."""
-        crawler = UniversalDocsCrawler()
         crawler.setup_for_website(url)
 
         include_patterns = crawler.url_patterns.get("include", [])
@@ -64,19 +119,27 @@ class TestUniversalDocsCrawler:
         [
             ("https://example.com/docs/install", "https://example.com", True),
             ("https://other.com/docs", "https://example.com", False),
+            ("https://example.com.evil.net/docs", "https://example.com", False),
+            ("https://example.com@evil.net/docs", "https://example.com", False),
+            ("https://example.com?docs", "https://example.com", True),
             ("https://example.com/login", "https://example.com", False),
             ("https://example.com/docs/${url}", "https://example.com", False),
             ("https://example.com/docs/{{template}}", "https://example.com", False),
             ("javascript:void(0)", "https://example.com", False),
             ("mailto:test@example.com", "https://example.com", False),
+            ("https://example.com/docs/setup.EXE", "https://example.com", False),
+            ("https://example.com/docs/guide.pdf", "https://example.com", False),
             (None, "https://example.com", False),
         ],
     )
     def test_is_valid_url(
-        self, test_url: str | None, base_domain: str, expected: bool
+        self,
+        test_url: str | None,
+        base_domain: str,
+        expected: bool,
+        crawler: UniversalDocsCrawler,
     ) -> None:
         """Test URL validation functionality."""
-        crawler = UniversalDocsCrawler()
         crawler.domain = base_domain
         crawler.url_patterns = {
             "include": [".*docs.*"],
@@ -86,10 +149,128 @@ class TestUniversalDocsCrawler:
         result = crawler.is_valid_url(test_url) if test_url else False
         assert result == expected
 
-    def test_clean_markdown_for_llm(self) -> None:
-        """Test markdown cleaning functionality."""
-        crawler = UniversalDocsCrawler()
+    @pytest.mark.parametrize(
+        "path,expected",
+        [
+            ("${" * 3000, True),
+            ("{{" * 3000, True),
+            ("${a/${b}", False),
+            ("{{a}b}}", False),
+            ("{{a}", True),
+        ],
+    )
+    def test_is_valid_url_template_markers(
+        self, path: str, expected: bool, crawler: UniversalDocsCrawler
+    ) -> None:
+        """Test template detection on long runs of unclosed openers."""
+        crawler.domain = "https://example.com"
+        crawler.url_patterns = {"include": [".*docs.*"], "exclude": []}
+
+        assert crawler.is_valid_url(f"https://example.com/docs/{path}") == expected
+
+    def test_is_valid_url_rejection_is_shown(
+        self, crawler: UniversalDocsCrawler, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test cached URL rejections are still logged every time they are seen."""
+        caplog.set_level(logging.WARNING)
+        url = "https://example.com/docs/guide.pdf"
+
+        assert not crawler.is_valid_url(url)
+        assert not UniversalDocsCrawler().is_valid_url(url)
+        assert crawler.is_valid_urls([url]) == [False]
+
+        assert [record.getMessage() for record in caplog.records] == [
+            f"⚠️  Skipping file URL (not a webpage): {url}"
+        ] * 3
 
+    def test_queued_logging_respects_app_level(
+        self, capsys: pytest.CaptureFixture[str], caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test progress still prints when the application logs at WARNING."""
+        caplog.set_level(logging.WARNING)
+
+        with _queued_logging():
+            crawler_logger.info("progress line")
+            crawler_logger.warning("problem line")
+
+        assert capsys.readouterr().out == "progress line\n"
+        assert [record.getMessage() for record in caplog.records] == ["problem line"]
+
+    def test_is_valid_urls_batch(self, crawler: UniversalDocsCrawler) -> None:
+        """Test batch URL validation agrees with the single-URL check."""
+        crawler.domain = "https://example.com"
+        crawler.url_patterns = {"include": [".*docs.*"], "exclude": [r".*/login.*"]}
+        urls = [
+            "https://example.com/docs/guide",
+            "https://example.com/docs/login",
+            "https://other.com/docs/guide",
+            "https://example.com/docs/guide.pdf",
+            "",
+            None,
+        ]
+
+        assert crawler.is_valid_urls(urls) == [True, False, False, False, False, False]
+        assert crawler.is_valid_urls(urls) == [crawler.is_valid_url(u) for u in urls]
+
+    def test_is_valid_url_conditional_group_pattern(
+        self, crawler: UniversalDocsCrawler
+    ) -> None:
+        """Test a conditional group keeps its numbering among other patterns."""
+        crawler.domain = "https://example.com"
+        crawler.url_patterns = {
+            "include": [".*(foo)bar.*", r".*/(x)?(?(1)y|z)q.*"],
+            "exclude": [],
+        }
+
+        assert crawler.is_valid_url("https://example.com/xyq")
+        assert crawler.is_valid_url("https://example.com/zq")
+        assert not crawler.is_valid_url("https://example.com/xzq")
+
+    def test_is_valid_url_tracks_pattern_changes(
+        self, crawler: UniversalDocsCrawler
+    ) -> None:
+        """Test memoized validation still honours updated patterns."""
+        crawler.domain = "https://example.com"
+        crawler.url_patterns = {"include": [".*docs.*"], "exclude": []}
+        url = "https://example.com/docs/admin"
+
+        assert crawler.is_valid_url(url)
+        assert crawler.is_valid_url(url)
+
+        crawler.url_patterns["exclude"] = [r".*/admin.*"]
+        assert not crawler.is_valid_url(url)
+
+    def test_is_valid_url_with_unfusable_patterns(
+        self, crawler: UniversalDocsCrawler
+    ) -> None:
+        """Test patterns that cannot share one alternation are still honoured."""
+        crawler.domain = "https://example.com"
+        crawler.url_patterns = {
+            "include": ["(?i).*DOCS.*", ".*guide.*"],
+            "exclude": [r".*/(\w+)/\1/.*"],
+        }
+
+        assert crawler.is_valid_url("https://example.com/docs/intro")
+        assert crawler.is_valid_url("https://example.com/guide/intro")
+        assert not crawler.is_valid_url("https://example.com/docs/a/a/intro")
+
+    def test_is_valid_url_literal_patterns(self, crawler: UniversalDocsCrawler) -> None:
+        """Test .*literal.* patterns keep regex case-insensitive semantics."""
+        crawler.domain = "https://example.com"
+        crawler.url_patterns = {
+            "include": [".*/docs/.*"],
+            "exclude": [r".*/LOGIN.*", r".*\.bak.*", ".*kit.*"],
+        }
+
+        assert crawler.is_valid_url("https://example.com/DOCS/intro")
+        assert not crawler.is_valid_url("https://example.com/docs/login")
+        assert not crawler.is_valid_url("https://example.com/docs/a.BAK/x")
+        assert crawler.is_valid_url("https://example.com/docs/abak/x")
+        # Kelvin sign matches "k" under IGNORECASE
+        assert not crawler.is_valid_url("https://example.com/docs/\u212ait")
+
+    def test_clean_markdown_for_llm(self, crawler: UniversalDocsCrawler) -> None:
+        """Test markdown cleaning functionality."""
         test_markdown = """
 # Main Title
 
@@ -121,10 +302,29 @@ Previous | Next
         assert "Edit this page" not in cleaned
         assert "Previous |" not in cleaned
 
-    def test_extract_title_and_description(self) -> None:
-        """Test title and description extraction."""
-        crawler = UniversalDocsCrawler()
+    def test_clean_markdown_for_llm_crlf(self, crawler: UniversalDocsCrawler) -> None:
+        """Test Windows line endings are normalized away."""
+        cleaned = crawler.clean_markdown_for_llm(
+            "# Title\r\n\r\nThis is good content.\r\nEdit this page\r\n",
+            "https://example.com",
+        )
+
+        assert "\r" not in cleaned
+        assert cleaned == "# Title\n\nThis is good content."
 
+    @pytest.mark.parametrize("separator", ["\v", "\f", "\x1c", "\x85", "\u2028"])
+    def test_clean_markdown_for_llm_only_splits_newlines(
+        self, separator: str, crawler: UniversalDocsCrawler
+    ) -> None:
+        """Test non-newline line-break characters are kept as content."""
+        cleaned = crawler.clean_markdown_for_llm(
+            f"# Title\n\nFirst part{separator}second part\n", "https://example.com"
+        )
+
+        assert cleaned == f"# Title\n\nFirst part{separator}second part"
+
+    def test_extract_title_and_description(self, crawler: UniversalDocsCrawler) -> None:
+        """Test title and description extraction."""
         test_markdown = """
 # Getting Started Guide
 
@@ -144,10 +344,10 @@ First, install the software...
         assert title == "Getting Started Guide"
         assert "comprehensive guide" in description
 
-    def test_extract_title_from_url_fallback(self) -> None:
+    def test_extract_title_from_url_fallback(
+        self, crawler: UniversalDocsCrawler
+    ) -> None:
         """Test title extraction fallback to URL when no headers found."""
-        crawler = UniversalDocsCrawler()
-
         test_markdown = "No headers here, just plain text."
 
         title, description = crawler.extract_title_and_description(
@@ -156,9 +356,8 @@ First, install the software...
 
         assert title == "Installation Guide"  # From URL path
 
-    def test_extract_links_from_content(self) -> None:
+    def test_extract_links_from_content(self, crawler: UniversalDocsCrawler) -> None:
         """Test link extraction from content."""
-        crawler = UniversalDocsCrawler()
         crawler.domain = "https://example.com"
         crawler.url_patterns = {"include": [".*"], "exclude": []}
 
@@ -177,18 +376,72 @@ First, install the software...
         # Should not include external links for this domain
         assert "https://external.com" not in links
 
-    def test_create_site_directory_new(self) -> None:
+    def test_create_site_directory_new(
+        self, crawler: UniversalDocsCrawler, tmp_path: Path
+    ) -> None:
         """Test site directory creation for new directory."""
-        crawler = UniversalDocsCrawler()
+        result_dir = crawler.create_site_directory(
+            str(tmp_path), "https://caddyserver.com/docs/"
+        )
 
-        with tempfile.TemporaryDirectory() as temp_dir:
+        expected_dir = os.path.join(tmp_path, "caddyserver")
+        assert result_dir == expected_dir
+        assert os.path.exists(result_dir)
+
+    @pytest.mark.parametrize(
+        "action,expect_new_dir",
+        [("overwrite", False), ("timestamp", True), ("prompt", True)],
+    )
+    def test_create_site_directory_existing(
+        self, action: str, expect_new_dir: bool, tmp_path: Path
+    ) -> None:
+        """Test existing directory handling never prompts without a TTY."""
+        crawler = UniversalDocsCrawler({"on_existing_dir": action})
+
+        existing_dir = os.path.join(tmp_path, "caddyserver")
+        os.makedirs(existing_dir)
+        open(os.path.join(existing_dir, "old.md"), "w").close()
+
+        with (
+            patch("sys.stdin.isatty", return_value=False),
+            patch("builtins.input", side_effect=AssertionError("prompted")),
+        ):
             result_dir = crawler.create_site_directory(
-                temp_dir, "https://caddyserver.com/docs/"
+                str(tmp_path), "https://caddyserver.com/docs/"
             )
 
-            expected_dir = os.path.join(temp_dir, "caddyserver")
-            assert result_dir == expected_dir
-            assert os.path.exists(result_dir)
+        assert (result_dir != existing_dir) == expect_new_dir
+        assert os.path.exists(os.path.join(existing_dir, "old.md")) == expect_new_dir
+
+    def test_create_site_directory_existing_fail(self, tmp_path: Path) -> None:
+        """Test the fail policy refuses to reuse an existing directory."""
+        crawler = UniversalDocsCrawler({"on_existing_dir": "fail"})
+
+        os.makedirs(os.path.join(tmp_path, "caddyserver"))
+
+        with pytest.raises(FileExistsError):
+            crawler.create_site_directory(
+                str(tmp_path), "https://caddyserver.com/docs/"
+            )
+
+    def test_create_site_directory_prompt_reasks(
+        self, crawler: UniversalDocsCrawler, tmp_path: Path
+    ) -> None:
+        """Test the TTY prompt repeats until it gets a yes/no answer."""
+        existing_dir = os.path.join(tmp_path, "caddyserver")
+        os.makedirs(existing_dir)
+
+        with (
+            patch("sys.stdin.isatty", return_value=True),
+            patch("builtins.input", side_effect=["maybe", " No "]) as mock_input,
+        ):
+            result_dir = crawler.create_site_directory(
+                str(tmp_path), "https://caddyserver.com/docs/"
+            )
+
+        assert mock_input.call_count == 2
+        assert result_dir != existing_dir
+        assert os.path.exists(existing_dir)
 
     @pytest.mark.parametrize(
         "url,expected_site_name",
@@ -200,18 +453,22 @@ First, install the software...
             ("https://opentofu.org/docs/", "opentofu"),
         ],
     )
-    def test_site_name_extraction(self, url: str, expected_site_name: str) -> None:
+    def test_site_name_extraction(
+        self,
+        url: str,
+        expected_site_name: str,
+        crawler: UniversalDocsCrawler,
+        tmp_path: Path,
+    ) -> None:
         """Test site name extraction from various URL patterns."""
-        crawler = UniversalDocsCrawler()
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            result_dir = crawler.create_site_directory(temp_dir, url)
-            actual_site_name = os.path.basename(result_dir)
-            assert actual_site_name == expected_site_name
+        result_dir = crawler.create_site_directory(str(tmp_path), url)
+        actual_site_name = os.path.basename(result_dir)
+        assert actual_site_name == expected_site_name
 
-    def test_save_llm_optimized_results(self) -> None:
+    def test_save_llm_optimized_results(
+        self, crawler: UniversalDocsCrawler, tmp_path: Path
+    ) -> None:
         """Test saving results in LLM-optimized format."""
-        crawler = UniversalDocsCrawler()
         crawler.base_url = "https://example.com/docs"
 
         # Mock results data
@@ -229,11 +486,8 @@ First, install the software...
             }
         ]
 
-        with (
-            tempfile.TemporaryDirectory() as temp_dir,
-            patch("builtins.input", return_value="n"),
-        ):  # Don't overwrite, create new
-            files = crawler.save_llm_optimized_results(results, temp_dir)
+        with patch("builtins.input", return_value="n"):  # Don't overwrite, create new
+            files = crawler.save_llm_optimized_results(results, str(tmp_path))
 
             combined_file, metadata_file, index_file, sections_dir, chunks_dir = files
 
@@ -251,6 +505,89 @@ First, install the software...
                 assert "User Guide" in content
                 assert "example.com" in content
 
+    def test_save_metadata_without_page_bodies(self, tmp_path: Path) -> None:
+        """Test metadata can omit page bodies already saved elsewhere."""
+        import json
+
+        crawler = UniversalDocsCrawler({"embed_pages_in_metadata": False})
+        results = [
+            {
+                "url": "https://example.com/docs/guide",
+                "title": "User Guide",
+                "path": "guide",
+                "markdown": "# User Guide\n\nContent here",
+                "raw_html": "<h1>User Guide</h1>",
+                "content_length": 100,
+                "word_count": 20,
+            }
+        ]
+
+        filename = os.path.join(tmp_path, "metadata.json")
+        crawler.save_metadata(results, filename, "example")
+
+        with open(filename, encoding="utf-8") as f:
+            metadata = json.load(f)
+
+        page = metadata["pages"][0]
+        assert page["title"] == "User Guide"
+        assert "markdown" not in page
+        assert "raw_html" not in page
+        assert metadata["crawl_stats"]["total_words"] == 20
+
+    def test_save_metadata_never_embeds_raw_html(
+        self, crawler: UniversalDocsCrawler, tmp_path: Path
+    ) -> None:
+        """Test raw HTML stays out of the metadata even with page bodies on."""
+        import json
+
+        results = [
+            {
+                "url": "https://example.com/docs/guide",
+                "title": "User Guide",
+                "path": "guide",
+                "markdown": "# User Guide\n\nContent here",
+                "raw_html": "<h1>User Guide</h1>",
+                "content_length": 100,
+                "word_count": 20,
+            }
+        ]
+
+        filename = os.path.join(tmp_path, "metadata.json")
+        crawler.save_metadata(results, filename, "example")
+
+        with open(filename, encoding="utf-8") as f:
+            metadata = json.load(f)
+
+        page = metadata["pages"][0]
+        assert page["markdown"] == "# User Guide\n\nContent here"
+        assert "raw_html" not in page
+
+    def test_save_metadata_keeps_existing_file_on_failure(
+        self, crawler: UniversalDocsCrawler, tmp_path: Path
+    ) -> None:
+        """Test a failed metadata write leaves the previous file intact."""
+        results = [
+            {
+                "url": "https://example.com/docs/guide",
+                "title": "User Guide",
+                "path": "guide",
+                "content_length": 100,
+                "word_count": 20,
+                "unserializable": object(),
+            }
+        ]
+
+        filename = os.path.join(tmp_path, "metadata.json")
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write("{}")
+
+        with pytest.raises(TypeError):
+            crawler.save_metadata(results, filename, "example")
+
+        with open(filename, encoding="utf-8") as f:
+            assert f.read() == "{}"
+        assert os.listdir(tmp_path) == ["metadata.json"]
+
     @pytest.mark.asyncio
     async def test_crawl_page_success(self) -> None:
         """Test successful page crawling."""
@@ -261,19 +598,12 @@ First, install the software...
         crawler.url_patterns = {"include": [".*"], "exclude": []}
 
         # Mock crawler response with longer content
-        mock_result = MagicMock()
-        mock_result.success = True
-        mock_result.markdown = (
-            "# Test Page\n\nThis is test content with good information. "
-            "This page contains detailed documentation about the testing framework "
-            "and provides comprehensive examples for developers to understand "
-            "the implementation details and best practices."
+        mock_result = _make_result(
+            _TEST_PAGE_MARKDOWN, html='<a href="/test">Test Link</a>'
         )
-        mock_result.html = '<a href="/test">Test Link</a>'
-        mock_result.status_code = 200
 
         mock_crawler = AsyncMock()
-        mock_crawler.arun.return_value = mock_result
+        mock_crawler.arun = AsyncMock(return_value=mock_result)
 
         page_data, links = await crawler.crawl_page(
             mock_crawler, "https://example.com/test"
@@ -282,22 +612,42 @@ First, install the software...
         assert page_data is not None
         assert page_data["title"] == "Test Page"
         assert page_data["url"] == "https://example.com/test"
+        assert page_data["raw_html"] == mock_result.html
         assert len(links) > 0
 
     @pytest.mark.asyncio
-    async def test_crawl_page_failure(self) -> None:
+    async def test_crawl_page_without_raw_html(self) -> None:
+        """Test raw HTML is not kept when it will not be saved."""
+        crawler = UniversalDocsCrawler({"min_content_length": 10}, keep_raw_html=False)
+        crawler.domain = "https://example.com"
+        crawler.url_patterns = {"include": [".*"], "exclude": []}
+
+        mock_result = _make_result(
+            "# Test Page\n\nEnough content to keep this page.",
+            html="<h1>Test Page</h1>",
+        )
+
+        mock_crawler = AsyncMock()
+        mock_crawler.arun = AsyncMock(return_value=mock_result)
+
+        page_data, _ = await crawler.crawl_page(
+            mock_crawler, "https://example.com/test"
+        )
+
+        assert page_data is not None
+        assert "raw_html" not in page_data
+
+    @pytest.mark.asyncio
+    async def test_crawl_page_failure(self, crawler: UniversalDocsCrawler) -> None:
         """Test page crawling failure handling."""
-        crawler = UniversalDocsCrawler()
         crawler.domain = "https://example.com"
         crawler.url_patterns = {"include": [".*"], "exclude": []}
 
         # Mock failed crawler response
-        mock_result = MagicMock()
-        mock_result.success = False
-        mock_result.status_code = 404
+        mock_result = _make_result("", success=False, status_code=404)
 
         mock_crawler = AsyncMock()
-        mock_crawler.arun.return_value = mock_result
+        mock_crawler.arun = AsyncMock(return_value=mock_result)
 
         page_data, links = await crawler.crawl_page(
             mock_crawler, "https://example.com/notfound"
@@ -308,9 +658,8 @@ First, install the software...
         assert "https://example.com/notfound" in crawler.failed_urls
 
     @pytest.mark.asyncio
-    async def test_crawl_page_invalid_url(self) -> None:
+    async def test_crawl_page_invalid_url(self, crawler: UniversalDocsCrawler) -> None:
         """Test crawling with invalid URL."""
-        crawler = UniversalDocsCrawler()
         crawler.domain = "https://example.com"
         crawler.url_patterns = {"include": [".*docs.*"], "exclude": []}
 
@@ -330,28 +679,90 @@ First, install the software...
 class TestConfigurationFunctions:
     """Test configuration-related functions."""
 
-    def test_create_sample_config(self) -> None:
+    def test_create_sample_config(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Test sample configuration creation."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            original_cwd = os.getcwd()
-            os.chdir(temp_dir)
+        monkeypatch.chdir(tmp_path)
+
+        # This will create a config file
+        create_sample_config()
+
+        # Check that file was created
+        assert (tmp_path / "crawler_config.yaml").exists()
+
+        # Check file content structure
+        with open("crawler_config.yaml") as f:
+            content = f.read()
+            assert "crawl_settings" in content
+            assert "max_pages" in content
+            assert "url_patterns" in content
+
+        # The hand-written template must stay valid YAML
+        config = yaml.safe_load(content)
+        assert config["crawl_settings"]["page_timeout"] == 30000
+        assert config["url_patterns"]["include"] == []
+        assert config["url_patterns"]["exclude"][-2] == r".*\$\{.*\}.*"
+        assert config["output"]["on_existing_dir"] == "prompt"
 
-            try:
-                # This will create a config file
-                create_sample_config()
+    @pytest.mark.parametrize(
+        "name,content", [("list.yaml", "- max_pages: 5\n"), ("list.json", "[1, 2]")]
+    )
+    def test_load_config_rejects_non_mapping(
+        self, tmp_path: Path, name: str, content: str
+    ) -> None:
+        """Test a config whose top level is not a mapping raises ValueError"""
+        path = tmp_path / name
+        path.write_text(content)
 
-                # Check that file was created
-                assert os.path.exists("crawler_config.yaml")
+        with pytest.raises(ValueError, match="config must be a mapping"):
+            _load_config(str(path))
 
-                # Check file content structure
-                with open("crawler_config.yaml") as f:
-                    content = f.read()
-                    assert "crawl_settings" in content
-                    assert "max_pages" in content
-                    assert "url_patterns" in content
+    @pytest.mark.asyncio
+    async def test_load_cli_config_flattens_sample_sections(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the sample config's section keys reach the crawler"""
+        monkeypatch.chdir(tmp_path)
+        create_sample_config()
 
-            finally:
-                os.chdir(original_cwd)
+        config = await _load_cli_config("crawler_config.yaml")
+
+        assert config["concurrency"] == 8
+        assert config["embed_pages_in_metadata"] is True
+        assert config["url_patterns"]["include"] == []
+        assert "crawl_settings" not in config
+
+    @pytest.mark.asyncio
+    async def test_load_cli_config_empty_yaml(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test an empty YAML config is reported and falls back to defaults"""
+        path = tmp_path / "empty.yaml"
+        path.write_text("")
+
+        assert await _load_cli_config(str(path)) == {}
+        assert "Could not load config" in capsys.readouterr().out
+
+    @pytest.mark.asyncio
+    async def test_sample_on_existing_dir_is_honoured(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test on_existing_dir set in the sample's output section applies"""
+        monkeypatch.chdir(tmp_path)
+        create_sample_config()
+        sample = Path("crawler_config.yaml")
+        sample.write_text(
+            sample.read_text().replace(
+                "on_existing_dir: prompt", "on_existing_dir: fail"
+            )
+        )
+        (tmp_path / "out" / "example").mkdir(parents=True)
+
+        crawler = UniversalDocsCrawler(await _load_cli_config(str(sample)))
+
+        with pytest.raises(FileExistsError):
+            crawler.create_site_directory("out", "https://example.com/docs/")
 
 
 class TestIntegrationScenarios:
@@ -368,28 +779,14 @@ class TestIntegrationScenarios:
             mock_crawler_class.return_value.__aenter__.return_value = mock_crawler
 
             # Mock first page response with longer content
-            mock_result1 = MagicMock()
-            mock_result1.success = True
-            mock_result1.markdown = (
-                "# Home\n\nWelcome to our comprehensive documentation portal. "
-                "This site contains detailed guides, tutorials, and reference materials "
-                "to help you get started with our platform and understand all features."
+            mock_result1 = _make_result(
+                _HOME_MARKDOWN, html='<a href="/guide">Guide</a>'
             )
-            mock_result1.html = '<a href="/guide">Guide</a>'
-            mock_result1.status_code = 200
 
             # Mock second page response with longer content
-            mock_result2 = MagicMock()
-            mock_result2.success = True
-            mock_result2.markdown = (
-                "# Guide\n\nThis detailed guide provides step-by-step instructions "
-                "for using our platform effectively. It covers installation, configuration, "
-                "and advanced usage patterns with comprehensive examples."
-            )
-            mock_result2.html = ""
-            mock_result2.status_code = 200
+            mock_result2 = _make_result(_GUIDE_MARKDOWN)
 
-            mock_crawler.arun.side_effect = [mock_result1, mock_result2]
+            mock_crawler.arun = AsyncMock(side_effect=[mock_result1, mock_result2])
 
             # Run the crawl
             results = await crawler.deep_crawl("https://example.com/docs/", max_pages=2)
@@ -399,10 +796,8 @@ class TestIntegrationScenarios:
             assert results[0]["title"] == "Home"
             assert results[1]["title"] == "Guide"
 
-    def test_error_handling_robustness(self) -> None:
+    def test_error_handling_robustness(self, crawler: UniversalDocsCrawler) -> None:
         """Test that the crawler handles various error conditions gracefully."""
-        crawler = UniversalDocsCrawler()
-
         # Test with None input
         assert not crawler.is_valid_url(None)
 
@@ -425,23 +820,18 @@ class TestIntegrationScenarios:
 class TestEdgeCases:
     """Test edge cases and error conditions."""
 
-    def test_very_long_content(self) -> None:
+    def test_very_long_content(
+        self, long_markdown: str, crawler: UniversalDocsCrawler
+    ) -> None:
         """Test handling of very long content."""
-        crawler = UniversalDocsCrawler()
-
-        # Create very long markdown content
-        long_content = "# Title\n\n" + "This is a very long paragraph. " * 1000
-
-        cleaned = crawler.clean_markdown_for_llm(long_content, "https://example.com")
+        cleaned = crawler.clean_markdown_for_llm(long_markdown, "https://example.com")
 
         # Should still work and not crash
         assert "Title" in cleaned
         assert len(cleaned) > 0
 
-    def test_special_characters_in_content(self) -> None:
+    def test_special_characters_in_content(self, crawler: UniversalDocsCrawler) -> None:
         """Test handling of special characters and encoding."""
-        crawler = UniversalDocsCrawler()
-
         special_content = """
 # Title with émojis 🚀
 
@@ -457,9 +847,8 @@ Content with special chars: äöü, 中文, русский
         assert "äöü" in cleaned
         assert "中文" in cleaned
 
-    def test_deeply_nested_paths(self) -> None:
+    def test_deeply_nested_paths(self, crawler: UniversalDocsCrawler) -> None:
         """Test URL validation with deeply nested paths."""
-        crawler = UniversalDocsCrawler()
         crawler.domain = "https://example.com"
         crawler.url_patterns = {"include": [".*docs.*"], "exclude": []}
 
@@ -476,9 +865,10 @@ Content with special chars: äöü, 中文, русский
             "https://",  # Incomplete URL
         ],
     )
-    def test_invalid_url_inputs(self, invalid_input: str) -> None:
+    def test_invalid_url_inputs(
+        self, invalid_input: str, crawler: UniversalDocsCrawler
+    ) -> None:
         """Test various invalid URL inputs."""
-        crawler = UniversalDocsCrawler()
         crawler.domain = "https://example.com"
 
         assert not crawler.is_valid_url(invalid_input)
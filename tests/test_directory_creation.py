@@ -1,52 +1,26 @@
 #!/usr/bin/env python3
 """
-Test script to demonstrate the new directory creation functionality
+Tests for the site directory names derived from documentation URLs
 """
 
-from urllib.parse import urlparse
-
-
-def extract_site_name(url: str) -> str:
-    """Extract site name from URL using the same logic as the main code"""
-    parsed_url = urlparse(url)
-    domain = parsed_url.netloc.lower()
-
-    # Remove common prefixes and get clean site name
-    site_name = domain.replace("www.", "").replace("docs.", "")
-
-    # Handle special cases for common documentation patterns
-    if "." in site_name:
-        parts = site_name.split(".")
-        if len(parts) >= 2:
-            if parts[0] in ["docs", "documentation", "help", "api"]:
-                site_name = parts[1]  # Use second part if first is docs-related
-            else:
-                site_name = parts[0]  # Use first part for normal domains
-
-    # Clean site name (remove any remaining special characters)
-    import re
-
-    site_name = re.sub(r"[^\w\-]", "", site_name)
-
-    return site_name
-
-
-# Test cases
-test_urls = [
-    "https://caddyserver.com/docs/",
-    "https://docs.netmaker.io/",
-    "https://opentofu.org/docs/",
-    "https://www.example.com/documentation/",
-    "https://api.github.com/docs/",
-]
-
-print("🧪 Testing directory name extraction:")
-print("=" * 50)
-
-for url in test_urls:
-    site_name = extract_site_name(url)
-    print(f"URL: {url}")
-    print(f"  → Directory: crawled_docs/{site_name}")
-    print()
-
-print("✅ Directory extraction test completed!")
+import pytest
+
+from crawl4dev.crawler import extract_site_name
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("https://caddyserver.com/docs/", "caddyserver"),
+        ("https://docs.netmaker.io/", "netmaker"),
+        ("https://opentofu.org/docs/", "opentofu"),
+        ("https://www.example.com/documentation/", "example"),
+        ("https://api.github.com/docs/", "github"),
+        ("https://foodocs.example.com/", "foodocs"),
+        ("https://www.docs.example.io/", "example"),
+        ("https://wwwdocs.example.com/", "wwwdocs"),
+    ],
+)
+def test_extract_site_name(url: str, expected: str) -> None:
+    """Test the directory name extracted for each documentation URL"""
+    assert extract_site_name(url) == expected